@@ -8,6 +8,7 @@ conversación al cambiar entre modelos.
 import streamlit as st
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Importar módulos propios
 from src.utils.logger import setup_logger
@@ -16,12 +17,16 @@ from src.utils.session_state import initialize_session_state, cleanup_temp_files
 from src.models.config import AVAILABLE_MODELS
 from src.api.groq_client import GroqClient
 from src.components.sidebar import render_sidebar
-from src.components.chat import display_chat_history, handle_user_input, display_agentic_context
+from src.components.chat import (
+    display_chat_history, handle_user_input, display_agentic_context,
+    start_speculative_response, discard_speculative_response
+)
 from src.components.audio import display_audio_input
-from src.components.file_generator import display_file_generator_info, handle_file_generation_request
+from src.components.file_generator import (
+    display_file_generator_info, handle_file_generation_request, is_file_generation_prompt,
+    is_explicit_file_request
+)
 from src.components.file_processor import display_file_uploader
-from src.api.audio_transcription import AudioTranscriber
-from src.api.file_generator import FileGenerator
 
 # Configuración de la página
 st.set_page_config(
@@ -30,6 +35,36 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource(show_spinner=False)
+def get_background_executor():
+    """
+    Obtiene un pool de hilos compartido para tareas de red en segundo plano.
+    
+    Returns:
+        ThreadPoolExecutor: Pool de hilos reutilizado entre ejecuciones del script.
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="metanoia")
+
+@st.cache_resource(show_spinner=False)
+def get_file_generator(_logger=None):
+    """
+    Obtiene el generador de archivos compartido entre ejecuciones del script.
+    
+    El directorio temporal se crea una sola vez junto con el generador.
+    
+    Args:
+        _logger (logging.Logger, optional): Logger para registrar información
+            (excluido del hash de la caché).
+        
+    Returns:
+        FileGenerator: Instancia única del generador de archivos.
+    """
+    from src.api.file_generator import FileGenerator
+    
+    temp_dir = os.path.join(tempfile.gettempdir(), "metanoia_files")
+    os.makedirs(temp_dir, exist_ok=True)
+    return FileGenerator(temp_dir=temp_dir, logger=_logger)
+
 def main():
     """Función principal de la aplicación."""
     # Configurar el logger
@@ -44,11 +79,6 @@ def main():
     # Inicializar el cliente de Groq
     groq_client = GroqClient(logger=logger)
     
-    # Inicializar el generador de archivos
-    temp_dir = os.path.join(tempfile.gettempdir(), "metanoia_files")
-    os.makedirs(temp_dir, exist_ok=True)
-    file_generator = FileGenerator(temp_dir=temp_dir, logger=logger)
-    
     # Título principal
     st.title("🤖 MetanoIA")
     st.markdown("Chat bot modular usando Streamlit y la API de Groq")
@@ -72,54 +102,123 @@ def main():
     
     # Procesar entrada de audio si está habilitada
     audio_data = display_audio_input(session_state)
+    transcription_future = None
+    cached_transcription = None
     if audio_data:
-        # Mostrar mensaje de procesamiento
-        with st.spinner(f"Transcribiendo audio con {audio_data['model']}..."):
-            # Inicializar el transcriptor de audio
-            transcriber = AudioTranscriber(groq_client, logger)
+        # Importar el transcriptor solo cuando hay audio que procesar
+        from src.api.audio_transcription import AudioTranscriber, MAX_UPLOAD_BYTES
+        
+        # Inicializar el transcriptor de audio
+        transcriber = AudioTranscriber(groq_client, logger)
+        
+        # Reutilizar la transcripción si este mismo audio ya se transcribió
+        transcription_key = transcriber.transcription_cache_key(
+            audio_data['path'], audio_data['model'], audio_data['language']
+        )
+        cached_transcription = transcriber.get_cached_result(transcription_key)
+        
+        if cached_transcription is None:
+            # Los audios que superan el límite de subida de Groq se dividen en
+            # fragmentos con ffmpeg; el resto se transcribe en streaming
+            is_large_audio = os.path.getsize(audio_data['path']) > MAX_UPLOAD_BYTES
             
-            # Transcribir el audio
-            result = transcriber.transcribe_audio(
+            # Lanzar la transcripción en segundo plano para que la petición HTTP
+            # se solape con el renderizado del historial del chat
+            transcription_future = get_background_executor().submit(
+                transcriber.transcribe_large_audio if is_large_audio else transcriber.open_transcription_stream,
                 audio_path=audio_data['path'],
                 model=audio_data['model'],
                 language=audio_data['language']
             )
+        
+        # Reservar el espacio donde se mostrará el resultado
+        audio_container = st.container()
+    
+    # Contenedor principal del chat
+    chat_container = st.container()
+    
+    # Mostrar mensajes anteriores
+    with chat_container:
+        display_chat_history(session_state, AVAILABLE_MODELS)
+    
+    if audio_data:
+        with audio_container:
+            status = st.empty()
+            text_placeholder = st.empty()
+            transcribed_text = ""
             
-            if result['success']:
-                # Mostrar el texto transcrito directamente en la interfaz
-                st.success("Audio transcrito correctamente")
+            try:
+                with st.spinner(f"Transcribiendo audio con {audio_data['model']}..."):
+                    if cached_transcription is not None:
+                        transcribed_text = cached_transcription["text"]
+                        text_placeholder.code(transcribed_text, language=None)
+                    elif is_large_audio:
+                        # Los fragmentos se transcriben en paralelo y se unen al terminar
+                        result = transcription_future.result()
+                        if not result["success"]:
+                            raise RuntimeError(result["error"])
+                        transcribed_text = result["text"]
+                        text_placeholder.code(transcribed_text, language=None)
+                    else:
+                        # Mostrar el texto transcrito a medida que llega, igual que en el chat
+                        for segment in transcriber.transcribe_audio_stream(
+                            audio_data['path'],
+                            model=audio_data['model'],
+                            language=audio_data['language'],
+                            pending_response=transcription_future
+                        ):
+                            transcribed_text += segment
+                            # Mostrar el texto en un bloque de código con botón de copia
+                            text_placeholder.code(transcribed_text, language=None)
                 
-                # Mostrar el texto transcrito con un botón de copia fácil
-                transcribed_text = result['text']
+                if cached_transcription is None:
+                    transcriber.store_cached_result(transcription_key, {
+                        "success": True,
+                        "model_used": audio_data['model'],
+                        "text": transcribed_text
+                    })
                 
-                # Mostrar el texto en un bloque de código con botón de copia
-                st.code(transcribed_text, language=None)
+                status.success("Audio transcrito correctamente")
                 
                 # Guardar el archivo temporal para limpieza posterior
                 if 'temp_audio_files' not in session_state:
                     session_state.temp_audio_files = []
                 session_state.temp_audio_files.append(audio_data['path'])
-            else:
-                st.error(f"Error al transcribir el audio: {result.get('error', 'Error desconocido')}")
+            except Exception as e:
+                logger.error(f"Error en la transcripción: {str(e)}")
+                status.error(f"Error al transcribir el audio: {str(e)}")
     
     # Limpiar archivos temporales al final de la sesión
     cleanup_temp_files(session_state)
     
-    # Contenedor principal del chat
-    chat_container = st.container()
-    
-    # Mostrar mensajes anteriores
-    with chat_container:
-        display_chat_history(session_state, AVAILABLE_MODELS)
-    
     # Entrada de usuario
     if prompt := st.chat_input("Escribe tu mensaje aquí..."):
-        # Verificar si es una solicitud de generación de archivo
-        is_file_request = handle_file_generation_request(prompt, session_state, groq_client, file_generator, logger)
+        # Si el prompt puede ser una solicitud de archivo, lanzar en paralelo la
+        # respuesta normal para no esperar a la llamada con herramientas.
+        # Coste: la respuesta especulativa es una llamada completa que se factura y
+        # consume el límite de tokens por minuto aunque luego se descarte. Por eso
+        # solo se especula cuando el prompt coincide con verbos genéricos ("crea",
+        # "haz", "texto"...) pero no nombra un archivo ni un formato, es decir,
+        # cuando lo más probable es que acabe siendo un mensaje normal
+        speculative = None
+        is_file_request = False
+        if is_file_generation_prompt(prompt):
+            if not is_explicit_file_request(prompt):
+                speculative = start_speculative_response(
+                    prompt, session_state, groq_client, logger, get_background_executor()
+                )
+            
+            # Obtener el generador de archivos solo cuando se necesita
+            file_generator = get_file_generator(logger)
+            
+            # Verificar si es una solicitud de generación de archivo
+            is_file_request = handle_file_generation_request(prompt, session_state, groq_client, file_generator, logger)
         
         # Si no es una solicitud de generación de archivo, manejar como un mensaje normal
         if not is_file_request:
-            handle_user_input(prompt, session_state, groq_client, logger)
+            handle_user_input(prompt, session_state, groq_client, logger, speculative=speculative)
+        elif speculative:
+            discard_speculative_response(speculative, logger)
 
 if __name__ == "__main__":
     main()
@@ -3,185 +3,68 @@ import streamlit as st
 from groq import Groq
 import time
 import datetime
+import json
 import logging
-
-# Configurar sistema de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+from src.utils.styles import apply_fresh_tech_theme
+from src.utils.file_utils import tokenize_text
+from src.utils.response_cache import ResponseCache, canonical_json
+
+# Configurar sistema de logging solo al ejecutarse como script (``streamlit run``),
+# no al importarse como módulo
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
 logger = logging.getLogger("psycho-bot")
 
 # Configuración de página
 st.set_page_config(page_title="Psycho-bot", layout="wide", initial_sidebar_state="expanded")
 
 # Aplicar CSS personalizado para tema "Fresh Tech"
-st.markdown("""
-<style>
-/* Tema base con gradiente para toda la aplicación */
-.stApp {
-    background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%) !important;
-    color: #e2e8f0 !important;
-}
-
-/* Estilos para la barra lateral con gradiente */
-.css-1d391kg, .css-1lcbmhc, .css-12oz5g7 {
-    background: linear-gradient(180deg, #1e1e2f 0%, #2d2d44 100%) !important;
-    border-right: 1px solid rgba(99, 102, 241, 0.2) !important;
-    box-shadow: 0 0 10px rgba(99, 102, 241, 0.1) !important;
-}
-
-/* Estilos para widgets en la barra lateral */
-.sidebar .stTextInput, .sidebar .stSelectbox, .sidebar .stSlider {
-    background-color: rgba(30, 41, 59, 0.7) !important;
-    color: #e2e8f0 !important;
-    border-radius: 8px !important;
-    border: 1px solid rgba(99, 102, 241, 0.3) !important;
-    backdrop-filter: blur(5px) !important;
-}
-
-/* Estilos para botones con efecto de neón */
-.stButton button {
-    background: linear-gradient(90deg, #4f46e5 0%, #6366f1 100%) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 8px !important;
-    padding: 0.5rem 1.5rem !important;
-    font-weight: 600 !important;
-    transition: all 0.3s ease !important;
-    box-shadow: 0 0 15px rgba(99, 102, 241, 0.5) !important;
-}
-
-.stButton button:hover {
-    background: linear-gradient(90deg, #6366f1 0%, #818cf8 100%) !important;
-    box-shadow: 0 0 20px rgba(99, 102, 241, 0.7) !important;
-    transform: translateY(-2px) !important;
-}
-
-/* Estilos para contenedores */
-div[data-testid="stVerticalBlock"] {
-    background-color: transparent !important;
-}
-
-/* Estilos para mensajes de chat con efecto de vidrio */
-.stChatMessage {
-    background-color: rgba(30, 41, 59, 0.7) !important;
-    backdrop-filter: blur(10px) !important;
-    border-radius: 12px !important;
-    padding: 1rem !important;
-    margin-bottom: 1rem !important;
-    box-shadow: 0 4px 20px rgba(0, 0, 0, 0.2) !important;
-    color: #e2e8f0 !important;
-    border: 1px solid rgba(99, 102, 241, 0.2) !important;
-}
-
-/* Estilos específicos para mensajes de usuario y asistente */
-.stChatMessage[data-testid="user"] {
-    background: linear-gradient(135deg, rgba(56, 189, 248, 0.2) 0%, rgba(59, 130, 246, 0.2) 100%) !important;
-    border-left: 5px solid #38bdf8 !important;
-}
-
-.stChatMessage[data-testid="assistant"] {
-    background: linear-gradient(135deg, rgba(134, 239, 172, 0.2) 0%, rgba(59, 130, 246, 0.2) 100%) !important;
-    border-left: 5px solid #86efac !important;
-}
-
-/* Estilos para texto en toda la aplicación */
-p, div, span, label, .stMarkdown, .stText {
-    color: #e2e8f0 !important;
-}
-
-/* Estilos para títulos con gradiente */
-h1 {
-    background: linear-gradient(90deg, #38bdf8 0%, #818cf8 100%) !important;
-    -webkit-background-clip: text !important;
-    -webkit-text-fill-color: transparent !important;
-    font-weight: 700 !important;
-}
-
-h2, h3, h4, h5, h6 {
-    color: #e2e8f0 !important;
-}
-
-/* Estilos para entrada de chat */
-.stChatInput > div {
-    background-color: rgba(30, 41, 59, 0.7) !important;
-    border: 1px solid rgba(99, 102, 241, 0.3) !important;
-    border-radius: 12px !important;
-    backdrop-filter: blur(5px) !important;
-}
+apply_fresh_tech_theme()
 
-.stChatInput input {
-    color: #e2e8f0 !important;
-}
-
-/* Estilos para selectbox */
-.stSelectbox > div > div {
-    background-color: rgba(30, 41, 59, 0.7) !important;
-    color: #e2e8f0 !important;
-    border: 1px solid rgba(99, 102, 241, 0.3) !important;
-    border-radius: 8px !important;
-}
-
-/* Estilos para sliders con colores vibrantes */
-.stSlider > div > div > div {
-    background: linear-gradient(90deg, #4f46e5 0%, #6366f1 100%) !important;
+# --- Definición de modelos disponibles ---
+models = {
+    "deepseek-r1-distill-llama-70b": "DeepSeek (128K)",
+    "meta-llama/llama-4-maverick-17b-128e-instruct": "Meta Maverick (131K)",
+    "meta-llama/llama-4-scout-17b-16e-instruct": "Meta Scout (131K)",
+    "qwen-qwq-32b": "Alibaba Qwen (128K)"
 }
 
-/* Estilos para textarea */
-.stTextArea > div > div > textarea {
-    background-color: rgba(30, 41, 59, 0.7) !important;
-    color: #e2e8f0 !important;
-    border: 1px solid rgba(99, 102, 241, 0.3) !important;
-    border-radius: 8px !important;
-    backdrop-filter: blur(5px) !important;
-}
+# Opciones del selector de modelo y su posición, calculadas una sola vez
+MODEL_KEYS = tuple(models.keys())
+MODEL_INDEX = {model_id: i for i, model_id in enumerate(MODEL_KEYS)}
 
-/* Arreglar problemas con la barra lateral */
-.css-1544g2n.e1fqkh3o4 {
-    padding-top: 2rem !important;
-    padding-right: 1rem !important;
-    padding-left: 1rem !important;
-    overflow-y: auto !important;
-}
+# Intervalo mínimo (segundos) entre repintados de la respuesta en streaming
+RENDER_INTERVAL = 0.05
 
-/* Estilos para scrollbars */
-::-webkit-scrollbar {
-    width: 8px;
-    background-color: rgba(15, 23, 42, 0.3);
-}
+# Número de mensajes iniciales que se mantienen fijos al inicio del contexto
+STABLE_HEAD_MESSAGES = 2
 
-::-webkit-scrollbar-thumb {
-    background: linear-gradient(180deg, #4f46e5 0%, #6366f1 100%);
-    border-radius: 10px;
+# Límites aproximados de tokens por minuto (TPM) de cada modelo en Groq.
+# El historial enviado se recorta para no superarlos junto con la respuesta.
+MODEL_TPM_LIMITS = {
+    "deepseek-r1-distill-llama-70b": 6000,
+    "meta-llama/llama-4-maverick-17b-128e-instruct": 6000,
+    "meta-llama/llama-4-scout-17b-16e-instruct": 30000,
+    "qwen-qwq-32b": 6000
 }
+DEFAULT_TPM_LIMIT = 6000
 
-::-webkit-scrollbar-thumb:hover {
-    background: linear-gradient(180deg, #6366f1 0%, #818cf8 100%);
-}
+# Estimación conservadora de tokens: el BPE de los modelos produce más de un token
+# por palabra en español y en código, así que se cuentan ~3 caracteres por token
+# más una sobrecarga fija por mensaje (rol y delimitadores)
+CHARS_PER_TOKEN = 3
+MESSAGE_TOKEN_OVERHEAD = 4
 
-/* Efecto de brillo sutil en los bordes */
-.stApp::before {
-    content: "";
-    position: fixed;
-    top: 0;
-    left: 0;
-    right: 0;
-    height: 2px;
-    background: linear-gradient(90deg, transparent, #38bdf8, transparent);
-    z-index: 1000;
-}
-</style>
-""", unsafe_allow_html=True)
+# Fracción del límite TPM que puede ocupar una petición; el resto queda como margen
+# para los errores de la estimación
+TPM_SAFETY_FACTOR = 0.8
 
-# --- Definición de modelos disponibles ---
-models = {
-    "deepseek-r1-distill-llama-70b": "DeepSeek (128K)",
-    "meta-llama/llama-4-maverick-17b-128e-instruct": "Meta Maverick (131K)",
-    "meta-llama/llama-4-scout-17b-16e-instruct": "Meta Scout (131K)",
-    "qwen-qwq-32b": "Alibaba Qwen (128K)"
-}
+# Roles del historial que se envían a la API
+API_ROLES = frozenset(("user", "assistant"))
 
 # --- Inicialización de variables de sesión ---
 if "messages" not in st.session_state:
@@ -214,39 +97,44 @@ with st.sidebar:
     # Usar key para forzar la recreación del widget cuando cambia el modelo
     selected_model = st.selectbox(
         "Selecciona un modelo",
-        options=list(models.keys()),
+        options=MODEL_KEYS,
         format_func=lambda x: models[x],
-        index=list(models.keys()).index(st.session_state.context["model"]) if st.session_state.context["model"] in models else 0,
+        index=MODEL_INDEX.get(st.session_state.context["model"], 0),
         key=f"model_select_{st.session_state.context['model']}"
     )
     
-    # Parámetros de generación
-    st.subheader("Parámetros")
-    temperature = st.slider(
-        "Temperatura", 
-        min_value=0.0, 
-        max_value=1.0, 
-        value=st.session_state.context["temperature"],
-        step=0.1,
-        help="Controla la aleatoriedad de las respuestas. Valores más altos = más creatividad."
-    )
-    
-    max_tokens = st.slider(
-        "Máximo de tokens", 
-        min_value=256, 
-        max_value=4096, 
-        value=st.session_state.context["max_tokens"],
-        step=128,
-        help="Número máximo de tokens en la respuesta."
-    )
-    
-    # System prompt
-    st.subheader("System Prompt")
-    system_prompt = st.text_area(
-        "Instrucciones para el asistente",
-        value=st.session_state.context["system_prompt"],
-        height=150
-    )
+    # Los parámetros se agrupan en un formulario: arrastrar un slider o escribir
+    # en el system prompt no relanza el script hasta pulsar "Aplicar"
+    with st.form("sidebar_params_form"):
+        # Parámetros de generación
+        st.subheader("Parámetros")
+        temperature = st.slider(
+            "Temperatura", 
+            min_value=0.0, 
+            max_value=1.0, 
+            value=st.session_state.context["temperature"],
+            step=0.1,
+            help="Controla la aleatoriedad de las respuestas. Valores más altos = más creatividad."
+        )
+        
+        max_tokens = st.slider(
+            "Máximo de tokens", 
+            min_value=256, 
+            max_value=4096, 
+            value=st.session_state.context["max_tokens"],
+            step=128,
+            help="Número máximo de tokens en la respuesta."
+        )
+        
+        # System prompt
+        st.subheader("System Prompt")
+        system_prompt = st.text_area(
+            "Instrucciones para el asistente",
+            value=st.session_state.context["system_prompt"],
+            height=150
+        )
+        
+        st.form_submit_button("Aplicar")
     
     # Actualizar contexto cuando cambian los valores
     if (selected_model != st.session_state.context["model"]):
@@ -274,18 +162,48 @@ with st.sidebar:
 st.title("🤖 Bot simple configurable")
 st.markdown("Chat bot usando Streamlit y la API de Groq")
 
+# --- Cliente de Groq compartido ---
+@st.cache_resource(show_spinner=False)
+def get_groq_client(api_key):
+    """Devuelve un cliente de Groq reutilizable por clave API.
+
+    El cliente mantiene su propio pool de conexiones HTTP, por lo que crearlo una
+    sola vez evita repetir el handshake TCP/TLS en cada mensaje.
+    """
+    logger.info("Creando cliente de Groq compartido")
+    return Groq(api_key=api_key)
+
+# --- Caché de respuestas (memoria + disco) ---
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    """Devuelve la caché de respuestas compartida entre ejecuciones del script."""
+    return ResponseCache(ttl=3600)
+
 # --- Función para llamar a la API con caché ---
-@st.cache_data(ttl=3600, show_spinner=False)
 def get_cached_response(model, messages_str, temperature, max_tokens):
-    """Función cacheada para obtener respuestas que no cambiarán con los mismos parámetros"""
+    """Función cacheada para obtener respuestas que no cambiarán con los mismos parámetros.
+
+    ``messages_str`` debe ser la serialización JSON canónica de los mensajes
+    (ver ``serialize_messages``); se usa como clave de caché y se decodifica
+    con ``json.loads`` en lugar de ``eval`` para no ejecutar código arbitrario.
+    La clave se calcula una sola vez con BLAKE2b y se consulta en la caché LRU
+    en memoria y en disco antes de llamar a la API.
+    """
+    cache = get_response_cache()
+    cache_key = cache.make_key(model, messages_str, temperature, max_tokens)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Respuesta obtenida de la caché para el modelo: {model}")
+        return cached
+    
     try:
         logger.info(f"Llamada a API (caché) con modelo: {model}, temperatura: {temperature}, max_tokens: {max_tokens}")
         start_time = time.time()
         
-        client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+        client = get_groq_client(os.environ.get("GROQ_API_KEY"))
         response = client.chat.completions.create(
             model=model,
-            messages=eval(messages_str),  # Convertir string a lista de diccionarios
+            messages=json.loads(messages_str),  # Convertir JSON a lista de diccionarios
             temperature=temperature,
             max_tokens=max_tokens
         )
@@ -293,11 +211,17 @@ def get_cached_response(model, messages_str, temperature, max_tokens):
         elapsed_time = time.time() - start_time
         logger.info(f"Respuesta recibida en {elapsed_time:.2f} segundos")
         
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        cache.set(cache_key, content)
+        return content
     except Exception as e:
         logger.error(f"Error al llamar a la API: {str(e)}")
         return f"Error al llamar a la API: {str(e)}"
 
+def serialize_messages(messages):
+    """Serializa los mensajes a JSON canónico (claves ordenadas) para usarlos como clave de caché."""
+    return canonical_json(messages)
+
 # --- Función para streaming de respuestas ---
 def generate_streaming_response(model, messages, temperature, max_tokens):
     """Genera respuestas en streaming para una experiencia más interactiva"""
@@ -311,7 +235,7 @@ def generate_streaming_response(model, messages, temperature, max_tokens):
         with st.spinner(f"Generando respuesta con {models.get(model, model)}..."):
             start_time = time.time()
             
-            client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+            client = get_groq_client(os.environ.get("GROQ_API_KEY"))
             stream = client.chat.completions.create(
                 model=model,
                 messages=messages,
@@ -323,15 +247,24 @@ def generate_streaming_response(model, messages, temperature, max_tokens):
             logger.info(f"Conexión establecida, comenzando streaming...")
             
             response_placeholder = st.empty()
-            full_response = ""
+            # Acumular los fragmentos en una lista y unirlos solo al repintar
+            parts = []
             chunk_count = 0
+            last_render = 0.0
             
             for chunk in stream:
                 chunk_count += 1
                 if hasattr(chunk.choices[0].delta, "content") and chunk.choices[0].delta.content is not None:
-                    full_response += chunk.choices[0].delta.content
-                    response_placeholder.markdown(full_response)
-                    time.sleep(0.01)  # Pequeña pausa para simular escritura
+                    parts.append(chunk.choices[0].delta.content)
+                    # Repintar como máximo cada RENDER_INTERVAL segundos para no saturar la interfaz
+                    now = time.monotonic()
+                    if now - last_render >= RENDER_INTERVAL:
+                        response_placeholder.markdown("".join(parts))
+                        last_render = now
+            
+            # Asegurar que el texto final completo quede visible
+            full_response = "".join(parts)
+            response_placeholder.markdown(full_response)
             
             elapsed_time = time.time() - start_time
             logger.info(f"Streaming completado: {chunk_count} chunks recibidos en {elapsed_time:.2f} segundos")
@@ -343,6 +276,67 @@ def generate_streaming_response(model, messages, temperature, max_tokens):
         logger.exception("Detalles del error:")
         return error_msg
 
+# --- Ventana de contexto por presupuesto de tokens ---
+def estimate_tokens(text):
+    """Estima por exceso el número de tokens de un texto.
+
+    Usa el mayor valor entre el número de palabras y signos y la longitud entre
+    ``CHARS_PER_TOKEN``, ya que el recuento por palabras subestima los tokens BPE.
+    """
+    return max(len(tokenize_text(text)), -(-len(text) // CHARS_PER_TOKEN)) + MESSAGE_TOKEN_OVERHEAD
+
+def count_tokens(msg):
+    """Devuelve el número estimado (por exceso) de tokens de un mensaje.
+
+    El recuento se guarda en ``msg["token_estimate"]`` para no volver a
+    calcularlo para el mismo mensaje en turnos posteriores.
+    """
+    if "token_estimate" not in msg:
+        msg["token_estimate"] = estimate_tokens(msg["content"])
+    return msg["token_estimate"]
+
+def build_context_window(messages, token_budget, stable_head=STABLE_HEAD_MESSAGES):
+    """Selecciona los mensajes del historial que se enviarán a la API.
+
+    Devuelve ``encabezado_estable + cola_reciente``: los primeros ``stable_head``
+    mensajes de la conversación se mantienen al inicio y sin cambios (si caben en
+    el presupuesto), y el resto se llena recorriendo el historial desde el mensaje
+    más reciente hacia atrás hasta agotar ``token_budget``. Así el prefijo del
+    prompt no se desplaza de un turno a otro y se aprovecha todo el presupuesto,
+    sean los mensajes cortos o largos. El último mensaje se incluye siempre.
+
+    Args:
+        messages (list): Historial completo de mensajes.
+        token_budget (int): Número máximo de tokens del historial.
+        stable_head (int): Número de mensajes iniciales que se fijan al inicio.
+
+    Returns:
+        list: Mensajes seleccionados en orden cronológico.
+    """
+    if not messages:
+        return []
+
+    if sum(count_tokens(msg) for msg in messages) <= token_budget:
+        return messages
+
+    # Reservar el encabezado estable solo si cabe junto al último mensaje
+    head = messages[:min(stable_head, len(messages) - 1)]
+    head_tokens = sum(count_tokens(msg) for msg in head)
+    if head_tokens + count_tokens(messages[-1]) > token_budget:
+        head, head_tokens = [], 0
+
+    remaining = token_budget - head_tokens
+    tail = []
+    for msg in reversed(messages[len(head):]):
+        tokens = count_tokens(msg)
+        if tail and tokens > remaining:
+            break
+        tail.append(msg)
+        remaining -= tokens
+
+    tail.reverse()
+    return head + tail
+
 # --- Contenedor principal del chat ---
 chat_container = st.container()
 
@@ -371,38 +365,35 @@ if prompt := st.chat_input("Escribe tu mensaje aquí..."):
     logger.info(f"Usando modelo seleccionado: {current_model} ({models.get(current_model, 'Desconocido')})")
     
     # Agregar mensaje del usuario al historial
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    user_message = {"role": "user", "content": prompt}
+    count_tokens(user_message)
+    st.session_state.messages.append(user_message)
     
     # Mostrar mensaje del usuario
     with st.chat_message("user"):
         st.markdown(prompt)
     
     # --- Preparar mensajes para la API (filtrando campos personalizados y limitando el contexto)
-    api_messages = [
-        {"role": "system", "content": st.session_state.context["system_prompt"]}
-    ]
-    
-    # Obtener el número máximo de mensajes a incluir según el modelo
+    # Calcular el presupuesto de tokens del historial según el modelo
     # Esto evita exceder los límites de tokens por minuto (TPM)
-    max_context_messages = 10  # Valor predeterminado
-    
-    # Ajustar el contexto según el modelo para evitar errores de límite de tokens
-    if "llama-4-maverick" in current_model:
-        max_context_messages = 5  # Limitar más para modelos que tienen límites más estrictos
-    elif "llama-4-scout" in current_model:
-        max_context_messages = 6
+    tpm_limit = MODEL_TPM_LIMITS.get(current_model, DEFAULT_TPM_LIMIT)
+    system_tokens = estimate_tokens(st.session_state.context["system_prompt"])
+    token_budget = max(int(tpm_limit * TPM_SAFETY_FACTOR) - st.session_state.context["max_tokens"] - system_tokens, 0)
     
     # Registrar el límite de contexto aplicado
-    logger.info(f"Limitando contexto a {max_context_messages} mensajes para el modelo {current_model}")
+    logger.info(f"Limitando contexto a {token_budget} tokens para el modelo {current_model}")
     
     # Añadir mensajes del historial filtrando campos personalizados y limitando la cantidad
-    # Tomamos solo los mensajes más recientes para no exceder los límites
-    recent_messages = st.session_state.messages[-max_context_messages:] if len(st.session_state.messages) > max_context_messages else st.session_state.messages
+    # Se conserva un encabezado estable (primeros mensajes) y solo rota la cola reciente,
+    # de modo que el prefijo enviado a Groq sea idéntico entre turnos y su caché de prefijos acierte
+    recent_messages = build_context_window(st.session_state.messages, token_budget)
     
-    for msg in recent_messages:
-        if msg["role"] in ["user", "assistant"]:
-            # Solo incluir campos estándar (role y content)
-            api_messages.append({"role": msg["role"], "content": msg["content"]})
+    # Solo incluir campos estándar (role y content)
+    api_messages = [{"role": "system", "content": st.session_state.context["system_prompt"]}] + [
+        {"role": msg["role"], "content": msg["content"]}
+        for msg in recent_messages
+        if msg["role"] in API_ROLES
+    ]
     
     # Mostrar respuesta del asistente
     with st.chat_message("assistant"):
@@ -423,4 +414,6 @@ if prompt := st.chat_input("Escribe tu mensaje aquí..."):
     
     # Agregar respuesta al historial con información del modelo usado
     model_used_info = f"[Generado por: {models.get(current_model, current_model)}]\n\n"
-    st.session_state.messages.append({"role": "assistant", "content": full_response, "model_used": current_model})
\ No newline at end of file
+    assistant_message = {"role": "assistant", "content": full_response, "model_used": current_model}
+    count_tokens(assistant_message)
+    st.session_state.messages.append(assistant_message)
\ No newline at end of file
@@ -3,13 +3,252 @@ Módulo para la transcripción de audio utilizando la API de Groq.
 """
 import os
 import time
+import logging
+import asyncio
+import hashlib
+import shutil
+import tempfile
+import functools
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import json
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils.response_cache import ResponseCache, DEFAULT_CACHE_DIR
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional: sin ella se usa el módulo json estándar
+    orjson = None
+
+try:
+    import h2  # noqa: F401 - necesario para que httpx use HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Límites del cliente asíncrono usado para lotes de audio
+ASYNC_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+ASYNC_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+
+# Tamaño máximo de archivo que se envía en una sola petición (Groq rechaza > 25 MB)
+MAX_UPLOAD_BYTES = 24 * 1024 * 1024
+
+# Duración de cada fragmento (segundos) al dividir audios largos con ffmpeg
+CHUNK_SECONDS = 600
+
+# Número máximo de fragmentos que se envían a la vez
+MAX_CONCURRENT_CHUNKS = 4
+
+# Política de reintentos: la transcripción no es idempotente (cada envío se factura),
+# así que solo se reintenta cuando es seguro que el servidor no procesó el audio:
+# errores de conexión y respuestas 408/429 (respetando Retry-After). Un error de
+# lectura o un 5xx pueden llegar después de aceptar la subida y no se reintentan.
+# El cuerpo multipart es rebobinable, así que un reintento solo repite el envío.
+AUDIO_RETRY = Retry(
+    total=5,
+    connect=3,
+    read=0,
+    status=3,
+    status_forcelist=(408, 429),
+    allowed_methods=frozenset(["POST"]),
+    backoff_factor=0.5,
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Conexiones que mantiene abiertas la sesión HTTP; el pool de hilos no la supera
+# para que cada subida concurrente reutilice una conexión TLS ya establecida
+AUDIO_POOL_MAXSIZE = 16
+
+# Tiempo máximo (segundos) de conexión y de lectura de las peticiones síncronas
+AUDIO_TIMEOUT = (10, 300)
+
+# Tipo MIME con el que se envían los archivos de audio
+AUDIO_CONTENT_TYPE = "application/octet-stream"
+
+def hash_file(path, block_size=1024 * 1024):
+    """
+    Calcula el resumen SHA-256 del contenido de un archivo leyendo por bloques.
+    
+    Args:
+        path (str): Ruta del archivo.
+        block_size (int): Tamaño de cada bloque de lectura en bytes.
+        
+    Returns:
+        str: Resumen hexadecimal del contenido.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+async def _single_chunk(audio_path):
+    """Generador asíncrono con un único fragmento (archivos que no necesitan dividirse)."""
+    yield audio_path
+
+@functools.lru_cache(maxsize=None)
+def get_audio_executor():
+    """
+    Obtiene el pool de hilos compartido para llamadas síncronas concurrentes.
+    
+    Returns:
+        ThreadPoolExecutor: Pool limitado al tamaño del pool de conexiones HTTP.
+    """
+    return ThreadPoolExecutor(
+        max_workers=min(AUDIO_POOL_MAXSIZE, (os.cpu_count() or 1) + 4),
+        thread_name_prefix="metanoia-audio"
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_audio_session():
+    """
+    Obtiene la sesión HTTP compartida por todos los transcriptores.
+    
+    La sesión mantiene abiertas las conexiones (keep-alive) entre transcripciones,
+    de modo que solo la primera petición paga el handshake TCP/TLS. No guarda la
+    cabecera de autorización: cada petición envía la de su propia clave API.
+    
+    Returns:
+        requests.Session: Sesión con pool de conexiones y política de reintentos.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=AUDIO_POOL_MAXSIZE, max_retries=AUDIO_RETRY))
+    return session
+
+@functools.lru_cache(maxsize=None)
+def get_transcription_cache():
+    """
+    Obtiene la caché de resultados de transcripción y traducción.
+    
+    Las entradas se indexan por el resumen del contenido del archivo, de modo que
+    volver a enviar el mismo audio no repite la llamada a la API.
+    
+    Returns:
+        ResponseCache: Caché compartida por todas las instancias.
+    """
+    return ResponseCache(
+        cache_dir=os.path.join(DEFAULT_CACHE_DIR, "transcriptions"),
+        maxsize=64,
+        ttl=7 * 24 * 3600
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_chunk_cache():
+    """
+    Obtiene la caché en disco de transcripciones de fragmentos de audio.
+    
+    Permite que los reintentos de un audio largo no vuelvan a facturar los
+    fragmentos que ya se transcribieron.
+    
+    Returns:
+        ResponseCache: Caché compartida por todas las instancias.
+    """
+    return ResponseCache(
+        cache_dir=os.path.join(DEFAULT_CACHE_DIR, "audio_chunks"),
+        maxsize=256,
+        ttl=7 * 24 * 3600
+    )
+
+class MultipartFileBody:
+    """
+    Cuerpo ``multipart/form-data`` que lee el archivo de audio del disco por bloques.
+    
+    Solo se mantienen en memoria la cabecera y el cierre del formulario; el
+    contenido del archivo se lee bajo demanda mientras se envía la petición. Al
+    exponer ``__len__``, ``tell`` y ``seek``, ``requests`` envía un
+    ``Content-Length`` exacto y ``urllib3`` puede rebobinar el cuerpo en los
+    reintentos.
+    """
+    
+    def __init__(self, fields, filename, file_obj, content_type=AUDIO_CONTENT_TYPE):
+        """
+        Prepara el cuerpo del formulario.
+        
+        Args:
+            fields (dict): Campos de texto del formulario.
+            filename (str): Nombre con el que se envía el archivo.
+            file_obj: Archivo abierto en modo binario.
+            content_type (str): Tipo MIME del archivo.
+        """
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in fields.items()
+        ]
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        )
+        self._prologue = "".join(parts).encode("utf-8")
+        self._epilogue = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        self._file = file_obj
+        self._file_size = os.fstat(file_obj.fileno()).st_size
+        self._file_end = len(self._prologue) + self._file_size
+        self._length = self._file_end + len(self._epilogue)
+        self._position = 0
+    
+    def __len__(self):
+        return self._length
+    
+    def tell(self):
+        return self._position
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._position = min(max(offset, 0), self._length)
+        return self._position
+    
+    def read(self, size=-1):
+        """
+        Lee hasta ``size`` bytes del cuerpo a partir de la posición actual.
+        
+        Args:
+            size (int): Número máximo de bytes; -1 lee hasta el final.
+            
+        Returns:
+            bytes: Siguiente bloque del cuerpo (vacío al llegar al final).
+        """
+        if size is None or size < 0:
+            size = self._length - self._position
+        
+        chunks = []
+        prologue_size = len(self._prologue)
+        while size > 0 and self._position < self._length:
+            if self._position < prologue_size:
+                chunk = self._prologue[self._position:self._position + size]
+            elif self._position < self._file_end:
+                self._file.seek(self._position - prologue_size)
+                chunk = self._file.read(min(size, self._file_end - self._position))
+                if not chunk:
+                    raise IOError("El archivo de audio cambió de tamaño durante el envío")
+            else:
+                start = self._position - self._file_end
+                chunk = self._epilogue[start:start + size]
+            chunks.append(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+        
+        return b"".join(chunks)
 
 class AudioTranscriber:
     """
     Clase para manejar la transcripción de audio utilizando la API de Groq.
     """
+    __slots__ = ("groq_client", "logger", "_auth_api_key", "_auth_headers")
+    
+    # Endpoints de la API de audio (constantes de clase)
+    transcription_endpoint = "https://api.groq.com/openai/v1/audio/transcriptions"
+    translation_endpoint = "https://api.groq.com/openai/v1/audio/translations"
+    
     def __init__(self, groq_client, logger=None):
         """
         Inicializa el transcriptor de audio.
@@ -20,115 +259,388 @@ class AudioTranscriber:
         """
         self.groq_client = groq_client
         self.logger = logger
-        self.transcription_endpoint = "https://api.groq.com/openai/v1/audio/transcriptions"
-        self.translation_endpoint = "https://api.groq.com/openai/v1/audio/translations"
+        self._auth_api_key = None
+        self._auth_headers = {}
+    
+    def _get_auth_headers(self):
+        """
+        Devuelve las cabeceras de autorización, regenerándolas solo si cambió la clave.
         
-    def transcribe_audio(self, audio_path, model="whisper-large-v3-turbo", language=None, response_format="text"):
+        Returns:
+            dict: Cabeceras con el token ``Bearer`` de la clave API actual.
         """
-        Transcribe un archivo de audio utilizando la API de Groq.
+        api_key = self.groq_client.api_key
+        if api_key != self._auth_api_key:
+            self._auth_headers = {"Authorization": f"Bearer {api_key}"}
+            self._auth_api_key = api_key
+        return self._auth_headers
+        
+    def _post_audio(self, endpoint, audio_path, data, stream=False):
+        """
+        Envía un archivo de audio a un endpoint de Groq a través de la sesión compartida.
+        
+        El cuerpo multipart se lee del disco por bloques mientras se envía, sin
+        cargar el archivo completo en memoria. El archivo se cierra siempre al
+        terminar la petición.
         
         Args:
-            audio_path (str): Ruta al archivo de audio a transcribir.
-            model (str): Modelo de Whisper a utilizar.
+            endpoint (str): URL del endpoint (transcripción o traducción).
+            audio_path (str): Ruta al archivo de audio.
+            data (dict): Campos del formulario (modelo, formato, idioma...).
+            stream (bool): Si es True, no se descarga el cuerpo de la respuesta.
+            
+        Returns:
+            tuple: Respuesta HTTP de la API y segundos transcurridos.
+        """
+        start_time = time.perf_counter()
+        
+        with open(audio_path, "rb") as audio_file:
+            body = MultipartFileBody(data, os.path.basename(audio_path), audio_file)
+            response = get_audio_session().post(
+                endpoint,
+                data=body,
+                headers={**self._get_auth_headers(), "Content-Type": body.content_type},
+                stream=stream,
+                timeout=AUDIO_TIMEOUT
+            )
+        
+        # Información de depuración de la respuesta (antes en un módulo aparte)
+        if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Código de estado: %s, tipo de contenido: %s",
+                response.status_code, response.headers.get("Content-Type", "desconocido")
+            )
+            if not stream:
+                self.logger.debug("Contenido de la respuesta: %s...", response.text[:500])
+        
+        return response, time.perf_counter() - start_time
+    
+    def _build_result(self, response, elapsed_time, data, action):
+        """
+        Convierte la respuesta HTTP de la API en el diccionario de resultado.
+        
+        Args:
+            response: Respuesta HTTP (``requests`` o ``httpx``).
+            elapsed_time (float): Segundos que tardó la petición.
+            data (dict): Campos enviados en la petición (modelo y formato).
+            action (str): Nombre de la operación para los mensajes ("Transcripción", "Traducción").
+            
+        Returns:
+            dict: Resultado con el texto y metadatos, o con el error producido.
+        """
+        if response.status_code != 200:
+            error_msg = f"Error en la API de Groq: {response.status_code} - {response.text}"
+            if self.logger:
+                self.logger.error(error_msg)
+            
+            result = {
+                "success": False,
+                "error": error_msg,
+                "status_code": response.status_code
+            }
+            
+            # Indicar al llamador cuánto esperar si se agotaron los reintentos por límite de uso
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                result["retry_after"] = retry_after
+            
+            return result
+        
+        result = {
+            "success": True,
+            "model_used": data["model"],
+            "duration_seconds": elapsed_time
+        }
+        
+        if data["response_format"] == "text":
+            result["text"] = response.text
+        else:
+            try:
+                # Para formatos JSON, la respuesta ya viene estructurada; orjson
+                # decodifica directamente los bytes sin pasar por str
+                if orjson is not None:
+                    response_data = orjson.loads(response.content)
+                else:
+                    response_data = response.json()
+                result["text"] = response_data.get("text", "")
+                result["data"] = response_data
+            except ValueError as e:
+                # Si el JSON no es válido, usar la respuesta como texto plano
+                if self.logger:
+                    self.logger.error("Error al procesar la respuesta JSON: %s", e)
+                result["text"] = response.text.strip()
+        
+        if self.logger:
+            self.logger.info("%s completada en %.2f segundos", action, elapsed_time)
+            self.logger.info("Longitud del texto: %d caracteres", len(result["text"]))
+        
+        return result
+    
+    @staticmethod
+    def transcription_cache_key(audio_path, model, language=None, response_format="text", action="Transcripción"):
+        """
+        Calcula la clave de la caché de transcripciones para un audio.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio.
+            model (str): Modelo de Whisper utilizado.
             language (str, optional): Código de idioma (ej. "es", "en").
-            response_format (str): Formato de respuesta ("text", "json", "verbose_json").
+            response_format (str): Formato de respuesta solicitado.
+            action (str): Nombre de la operación ("Transcripción", "Traducción").
             
         Returns:
-            dict: Resultado de la transcripción con el texto y metadatos.
+            str: Clave formada por el resumen del archivo y los parámetros.
+        """
+        return "-".join([action.lower(), hash_file(audio_path), model, language or "auto", response_format])
+    
+    def store_cached_result(self, cache_key, result):
+        """
+        Guarda un resultado correcto en la caché de transcripciones.
+        
+        Args:
+            cache_key (str): Clave calculada con ``transcription_cache_key``.
+            result (dict): Resultado con al menos "success", "model_used" y "text".
+        """
+        get_transcription_cache().set(cache_key, json.dumps(result, ensure_ascii=False))
+    
+    def get_cached_result(self, cache_key):
+        """
+        Busca un resultado previo en la caché de transcripciones.
+        
+        Args:
+            cache_key (str): Clave formada por el resumen del archivo y los parámetros.
+            
+        Returns:
+            dict or None: Copia del resultado marcada como cacheada, o None si no existe.
+        """
+        cached = get_transcription_cache().get(cache_key)
+        if cached is None:
+            return None
+        
+        result = json.loads(cached)
+        result["duration_seconds"] = 0.0
+        result["cached"] = True
+        
+        if self.logger:
+            self.logger.info("Resultado obtenido de la caché de transcripciones")
+        return result
+    
+    def _process_audio(self, endpoint, audio_path, data, action):
         """
-        if not self.groq_client.is_configured():
+        Flujo común de transcripción y traducción: caché, petición y resultado.
+        
+        Args:
+            endpoint (str): URL del endpoint (transcripción o traducción).
+            audio_path (str): Ruta al archivo de audio.
+            data (dict): Campos del formulario (modelo, formato, idioma...).
+            action (str): Nombre de la operación para los mensajes ("Transcripción", "Traducción").
+            
+        Returns:
+            dict: Resultado con el texto y metadatos, o con el error producido.
+        """
+        if not self.groq_client.configured:
             error_msg = "Error: API no configurada. Por favor, proporciona una clave API."
             if self.logger:
                 self.logger.error(error_msg)
             return {"success": False, "error": error_msg}
         
         try:
+            # Reutilizar el resultado si este mismo audio ya se procesó
+            cache_key = self.transcription_cache_key(
+                audio_path, data["model"], data.get("language"), data["response_format"], action
+            )
+            cached = self.get_cached_result(cache_key)
+            if cached is not None:
+                return cached
+            
             if self.logger:
-                self.logger.info(f"Iniciando transcripción de audio: {os.path.basename(audio_path)}")
-                self.logger.info(f"Modelo: {model}, Idioma: {language or 'auto'}")
+                self.logger.info("Iniciando %s de audio: %s", action.lower(), os.path.basename(audio_path))
+                self.logger.info("Modelo: %s, Idioma: %s", data["model"], data.get("language", "auto"))
             
-            start_time = time.time()
+            response, elapsed_time = self._post_audio(endpoint, audio_path, data)
+            # Devolver la conexión al pool en cuanto se procesa la respuesta
+            with response:
+                result = self._build_result(response, elapsed_time, data, action)
             
-            # Obtener la clave API del cliente de Groq
-            api_key = self.groq_client.api_key
+            if result["success"]:
+                self.store_cached_result(cache_key, result)
             
-            # Preparar los headers para la solicitud
-            headers = {
-                "Authorization": f"Bearer {api_key}"
-            }
+            return result
             
-            # Preparar los datos para la solicitud
-            files = {
-                "file": (os.path.basename(audio_path), open(audio_path, "rb"))
-            }
+        except Exception as e:
+            error_msg = f"Error en la {action.lower()}: {str(e)}"
+            if self.logger:
+                self.logger.error(error_msg)
+                self.logger.exception("Detalles del error:")
             
-            data = {
-                "model": model,
-                "response_format": response_format
+            return {
+                "success": False,
+                "error": error_msg
             }
+    
+    def transcribe_audio(self, audio_path, model="whisper-large-v3-turbo", language=None, response_format="text"):
+        """
+        Transcribe un archivo de audio utilizando la API de Groq.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio a transcribir.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            response_format (str): Formato de respuesta ("text", "json", "verbose_json").
             
-            # Añadir parámetros opcionales si están presentes
-            if language:
-                data["language"] = language
+        Returns:
+            dict: Resultado de la transcripción con el texto y metadatos.
+        """
+        data = {
+            "model": model,
+            "response_format": response_format
+        }
+        
+        # Añadir parámetros opcionales si están presentes
+        if language:
+            data["language"] = language
+        
+        return self._process_audio(self.transcription_endpoint, audio_path, data, "Transcripción")
+    
+    async def transcribe_audio_threaded(self, *args, **kwargs):
+        """
+        Ejecuta ``transcribe_audio`` en el pool de hilos sin bloquear el bucle de eventos.
+        
+        Acepta los mismos argumentos que ``transcribe_audio``.
+        
+        Returns:
+            dict: Resultado de la transcripción con el texto y metadatos.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_audio_executor(), functools.partial(self.transcribe_audio, *args, **kwargs)
+        )
+    
+    def submit_batch(self, audio_paths, **kwargs):
+        """
+        Lanza la transcripción de varios archivos en el pool de hilos compartido.
+        
+        Args:
+            audio_paths (list): Rutas de los archivos de audio.
+            **kwargs: Argumentos adicionales para ``transcribe_audio``.
             
-            # Realizar la solicitud HTTP directamente al endpoint de transcripción
-            response = requests.post(
-                self.transcription_endpoint,
-                headers=headers,
-                files=files,
-                data=data
-            )
+        Returns:
+            list: Futuros con el resultado de cada archivo, en el mismo orden.
+        """
+        executor = get_audio_executor()
+        return [executor.submit(self.transcribe_audio, path, **kwargs) for path in audio_paths]
+    
+    def open_transcription_stream(self, audio_path, model="whisper-large-v3-turbo", language=None):
+        """
+        Envía el audio al endpoint de transcripción sin consumir la respuesta.
+        
+        Permite subir el archivo por adelantado (por ejemplo, desde un hilo en
+        segundo plano) y leer el texto después con ``transcribe_audio_stream``.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio a transcribir.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
             
-            elapsed_time = time.time() - start_time
-            
-            # Verificar si la solicitud fue exitosa
-            if response.status_code == 200:
-                # Procesar la respuesta según el formato
-                if response_format == "text":
-                    result = {
-                        "success": True,
-                        "text": response.text,
-                        "model_used": model,
-                        "duration_seconds": elapsed_time
-                    }
-                else:
-                    # Para formatos JSON, la respuesta ya viene estructurada
-                    response_data = response.json()
-                    result = {
-                        "success": True,
-                        "text": response_data.get("text", ""),
-                        "data": response_data,
-                        "model_used": model,
-                        "duration_seconds": elapsed_time
-                    }
-                
-                if self.logger:
-                    self.logger.info(f"Transcripción completada en {elapsed_time:.2f} segundos")
-                    self.logger.info(f"Longitud del texto transcrito: {len(result.get('text', ''))} caracteres")
-            else:
-                # Si hubo un error, devolver la información del error
+        Returns:
+            requests.Response: Respuesta HTTP abierta en modo streaming.
+        """
+        if not self.groq_client.configured:
+            raise RuntimeError("API no configurada. Por favor, proporciona una clave API.")
+        
+        if self.logger:
+            self.logger.info("Iniciando transcripción de audio (streaming): %s", os.path.basename(audio_path))
+            self.logger.info("Modelo: %s, Idioma: %s", model, language or "auto")
+        
+        data = {
+            "model": model,
+            "response_format": "text"
+        }
+        
+        if language:
+            data["language"] = language
+        
+        response, _ = self._post_audio(self.transcription_endpoint, audio_path, data, stream=True)
+        return response
+    
+    def transcribe_audio_stream(self, audio_path, model="whisper-large-v3-turbo", language=None, pending_response=None):
+        """
+        Transcribe un archivo de audio devolviendo el texto a medida que llega.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio a transcribir.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            pending_response (Future, optional): Futuro con una respuesta abierta de
+                antemano mediante ``open_transcription_stream``. Si se proporciona, no
+                se realiza una nueva petición.
+            
+        Yields:
+            str: Fragmentos del texto transcrito.
+            
+        Raises:
+            RuntimeError: Si la API devuelve un error.
+        """
+        start_time = time.perf_counter()
+        
+        if pending_response is not None:
+            response = pending_response.result()
+        else:
+            response = self.open_transcription_stream(audio_path, model=model, language=language)
+        
+        try:
+            if response.status_code != 200:
                 error_msg = f"Error en la API de Groq: {response.status_code} - {response.text}"
                 if self.logger:
                     self.logger.error(error_msg)
-                
-                result = {
-                    "success": False,
-                    "error": error_msg,
-                    "status_code": response.status_code
-                }
+                raise RuntimeError(error_msg)
             
-            return result
+            # El endpoint devuelve texto plano; decodificar los fragmentos según llegan
+            response.encoding = response.encoding or "utf-8"
+            text_length = 0
+            for segment in response.iter_content(chunk_size=None, decode_unicode=True):
+                if segment:
+                    text_length += len(segment)
+                    yield segment
             
-        except Exception as e:
-            error_msg = f"Error en la transcripción: {str(e)}"
             if self.logger:
-                self.logger.error(error_msg)
-                self.logger.exception("Detalles del error:")
+                elapsed_time = time.perf_counter() - start_time
+                self.logger.info("Transcripción completada en %.2f segundos", elapsed_time)
+                self.logger.info("Longitud del texto transcrito: %d caracteres", text_length)
+        finally:
+            response.close()
+    
+    def debug_transcription_response(self, audio_path, model="whisper-large-v3-turbo", language="es"):
+        """
+        Obtiene la respuesta de transcripción en los tres formatos para depuración.
+        
+        Se hace una única petición con ``verbose_json`` (que incluye todo lo que
+        devuelven ``json`` y ``text``) y los otros formatos se derivan de ella, en
+        lugar de enviar el mismo audio tres veces.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma.
             
-            return {
-                "success": False,
-                "error": error_msg
-            }
+        Returns:
+            dict: Respuestas por formato ("verbose_json", "json", "text"), o un
+                diccionario con "error" si la petición falla.
+        """
+        result = self.transcribe_audio(audio_path, model=model, language=language, response_format="verbose_json")
+        if not result["success"]:
+            return {"error": result["error"]}
+        
+        verbose = result.get("data") or {"text": result["text"]}
+        
+        if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Respuesta verbose_json: %s...", json.dumps(verbose, ensure_ascii=False)[:500])
+        
+        return {
+            "verbose_json": verbose,
+            "json": {"text": verbose.get("text", "")},
+            "text": verbose.get("text", "")
+        }
     
     def translate_audio(self, audio_path, model="whisper-large-v3", response_format="text"):
         """
@@ -142,91 +654,365 @@ class AudioTranscriber:
         Returns:
             dict: Resultado de la traducción con el texto y metadatos.
         """
-        if not self.groq_client.is_configured():
+        data = {
+            "model": model,
+            "response_format": response_format
+        }
+        
+        return self._process_audio(self.translation_endpoint, audio_path, data, "Traducción")
+    
+    async def _post_audio_async(self, client, endpoint, audio_path, data, action):
+        """
+        Envía un archivo de audio a un endpoint de Groq de forma asíncrona.
+        
+        Args:
+            client (httpx.AsyncClient): Cliente HTTP asíncrono compartido.
+            endpoint (str): URL del endpoint (transcripción o traducción).
+            audio_path (str): Ruta al archivo de audio.
+            data (dict): Campos del formulario (modelo, formato, idioma...).
+            action (str): Nombre de la operación para los mensajes ("Transcripción", "Traducción").
+            
+        Returns:
+            dict: Resultado con el texto y metadatos, o con el error producido.
+        """
+        if not self.groq_client.configured:
             error_msg = "Error: API no configurada. Por favor, proporciona una clave API."
             if self.logger:
                 self.logger.error(error_msg)
             return {"success": False, "error": error_msg}
         
         try:
+            basename = os.path.basename(audio_path)
             if self.logger:
-                self.logger.info(f"Iniciando traducción de audio: {os.path.basename(audio_path)}")
-                self.logger.info(f"Modelo: {model}")
+                self.logger.info("%s asíncrona de audio: %s", action, basename)
+            
+            start_time = time.perf_counter()
             
-            start_time = time.time()
+            with open(audio_path, "rb") as audio_file:
+                files = {
+                    "file": (basename, audio_file, AUDIO_CONTENT_TYPE)
+                }
+                response = await client.post(
+                    endpoint,
+                    headers=self._get_auth_headers(),
+                    files=files,
+                    data=data
+                )
             
-            # Obtener la clave API del cliente de Groq
-            api_key = self.groq_client.api_key
+            elapsed_time = time.perf_counter() - start_time
             
-            # Preparar los headers para la solicitud
-            headers = {
-                "Authorization": f"Bearer {api_key}"
-            }
+            return self._build_result(response, elapsed_time, data, action)
             
-            # Preparar los datos para la solicitud
-            files = {
-                "file": (os.path.basename(audio_path), open(audio_path, "rb"))
-            }
+        except Exception as e:
+            error_msg = f"Error en la {action.lower()}: {str(e)}"
+            if self.logger:
+                self.logger.error(error_msg)
             
-            data = {
-                "model": model,
-                "response_format": response_format
+            return {
+                "success": False,
+                "error": error_msg
             }
+    
+    async def transcribe_audio_async(self, client, audio_path, model="whisper-large-v3-turbo", language=None, response_format="json"):
+        """
+        Transcribe un archivo de audio de forma asíncrona.
+        
+        Args:
+            client (httpx.AsyncClient): Cliente HTTP asíncrono compartido.
+            audio_path (str): Ruta al archivo de audio a transcribir.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            response_format (str): Formato de respuesta ("text", "json", "verbose_json").
+            
+        Returns:
+            dict: Resultado de la transcripción con el texto y metadatos.
+        """
+        data = {
+            "model": model,
+            "response_format": response_format
+        }
+        if language:
+            data["language"] = language
+        
+        return await self._post_audio_async(client, self.transcription_endpoint, audio_path, data, "Transcripción")
+    
+    async def translate_audio_async(self, client, audio_path, model="whisper-large-v3", response_format="json"):
+        """
+        Traduce un archivo de audio a inglés de forma asíncrona.
+        
+        Args:
+            client (httpx.AsyncClient): Cliente HTTP asíncrono compartido.
+            audio_path (str): Ruta al archivo de audio a traducir.
+            model (str): Modelo de Whisper a utilizar.
+            response_format (str): Formato de respuesta ("text", "json", "verbose_json").
+            
+        Returns:
+            dict: Resultado de la traducción con el texto y metadatos.
+        """
+        data = {
+            "model": model,
+            "response_format": response_format
+        }
+        
+        return await self._post_audio_async(client, self.translation_endpoint, audio_path, data, "Traducción")
+    
+    async def transcribe_batch_async(self, audio_paths, model="whisper-large-v3-turbo", language=None, response_format="json"):
+        """
+        Transcribe varios archivos de audio en paralelo.
+        
+        Todas las subidas comparten un único cliente HTTP (con HTTP/2 si ``h2``
+        está instalado), de modo que se solapan en lugar de ejecutarse en serie.
+        
+        Args:
+            audio_paths (list): Rutas de los archivos de audio.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            response_format (str): Formato de respuesta ("text", "json", "verbose_json").
             
-            # Realizar la solicitud HTTP directamente al endpoint de traducción
-            response = requests.post(
-                self.translation_endpoint,
-                headers=headers,
-                files=files,
-                data=data
+        Returns:
+            list: Resultados de la transcripción en el mismo orden que ``audio_paths``.
+        """
+        async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=ASYNC_POOL_LIMITS, timeout=ASYNC_TIMEOUT) as client:
+            return await asyncio.gather(*[
+                self.transcribe_audio_async(client, path, model=model, language=language, response_format=response_format)
+                for path in audio_paths
+            ])
+    
+    def transcribe_batch(self, audio_paths, model="whisper-large-v3-turbo", language=None, response_format="json"):
+        """
+        Versión síncrona de ``transcribe_batch_async``.
+        
+        Args:
+            audio_paths (list): Rutas de los archivos de audio.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            response_format (str): Formato de respuesta ("text", "json", "verbose_json").
+            
+        Returns:
+            list: Resultados de la transcripción en el mismo orden que ``audio_paths``.
+        """
+        return asyncio.run(self.transcribe_batch_async(
+            audio_paths, model=model, language=language, response_format=response_format
+        ))
+    
+    async def _iter_audio_chunks(self, audio_path, output_dir, chunk_seconds=CHUNK_SECONDS):
+        """
+        Divide un archivo de audio con ffmpeg (sin recodificar) y entrega cada
+        fragmento en cuanto ffmpeg termina de escribirlo.
+        
+        ffmpeg publica la lista de segmentos por su salida estándar
+        (``-segment_list pipe:1``), de modo que la subida del primer fragmento
+        puede empezar mientras se generan los siguientes.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio.
+            output_dir (str): Directorio donde se escriben los fragmentos.
+            chunk_seconds (int): Duración aproximada de cada fragmento.
+            
+        Yields:
+            str: Ruta de cada fragmento, en orden.
+            
+        Raises:
+            RuntimeError: Si ffmpeg no está instalado o falla la división.
+        """
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg no está instalado; no se pueden dividir audios de más de 25 MB.")
+        
+        extension = os.path.splitext(audio_path)[1] or ".mp3"
+        pattern = os.path.join(output_dir, f"chunk_%03d{extension}")
+        
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-loglevel", "error", "-i", audio_path,
+            "-f", "segment", "-segment_time", str(chunk_seconds),
+            "-reset_timestamps", "1", "-c", "copy",
+            "-segment_list", "pipe:1", "-segment_list_type", "flat",
+            pattern,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        try:
+            async for line in process.stdout:
+                name = line.decode("utf-8").strip()
+                if name:
+                    yield os.path.join(output_dir, os.path.basename(name))
+            
+            stderr = await process.stderr.read()
+            if await process.wait() != 0:
+                raise RuntimeError(f"Error al dividir el audio con ffmpeg: {stderr.decode('utf-8', 'replace').strip()}")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+    
+    async def _transcribe_chunk(self, client, semaphore, chunk_path, model, language):
+        """
+        Transcribe un fragmento usando la caché en disco por contenido.
+        
+        Args:
+            client (httpx.AsyncClient): Cliente HTTP asíncrono compartido.
+            semaphore (asyncio.Semaphore): Limita las subidas simultáneas.
+            chunk_path (str): Ruta al fragmento de audio.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma.
+            
+        Returns:
+            dict: Resultado de la transcripción del fragmento (formato verbose_json).
+        """
+        cache = get_chunk_cache()
+        cache_key = f"{hash_file(chunk_path)}-{model}-{language or 'auto'}"
+        
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if self.logger:
+                self.logger.info("Fragmento obtenido de la caché: %s", os.path.basename(chunk_path))
+            return json.loads(cached)
+        
+        async with semaphore:
+            result = await self.transcribe_audio_async(
+                client, chunk_path, model=model, language=language, response_format="verbose_json"
             )
+        
+        if result["success"]:
+            cache.set(cache_key, json.dumps(result, ensure_ascii=False))
+        return result
+    
+    async def iter_large_audio_transcription(self, audio_path, model="whisper-large-v3-turbo", language=None,
+                                             chunk_seconds=CHUNK_SECONDS, max_concurrency=MAX_CONCURRENT_CHUNKS):
+        """
+        Transcribe un audio de cualquier tamaño entregando los fragmentos en orden.
+        
+        Los archivos por debajo del límite de Groq se envían tal cual. Los más
+        grandes se dividen con ffmpeg y cada fragmento se sube en cuanto está
+        disponible, solapando la división con las subidas. Los resultados se
+        entregan en orden tan pronto como están listos.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio a transcribir.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            chunk_seconds (int): Duración aproximada de cada fragmento.
+            max_concurrency (int): Número máximo de fragmentos enviados a la vez.
             
-            elapsed_time = time.time() - start_time
-            
-            # Verificar si la solicitud fue exitosa
-            if response.status_code == 200:
-                # Procesar la respuesta según el formato
-                if response_format == "text":
-                    result = {
-                        "success": True,
-                        "text": response.text,
-                        "model_used": model,
-                        "duration_seconds": elapsed_time
-                    }
+        Yields:
+            dict: Resultado de cada fragmento (formato verbose_json), en orden.
+        """
+        temp_dir = None
+        tasks = []
+        
+        try:
+            async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=ASYNC_POOL_LIMITS, timeout=ASYNC_TIMEOUT) as client:
+                semaphore = asyncio.Semaphore(max_concurrency)
+                
+                if os.path.getsize(audio_path) > MAX_UPLOAD_BYTES:
+                    temp_dir = tempfile.mkdtemp(prefix="metanoia_audio_")
+                    chunk_paths = self._iter_audio_chunks(audio_path, temp_dir, chunk_seconds)
                 else:
-                    # Para formatos JSON, la respuesta ya viene estructurada
-                    response_data = response.json()
-                    result = {
-                        "success": True,
-                        "text": response_data.get("text", ""),
-                        "data": response_data,
-                        "model_used": model,
-                        "duration_seconds": elapsed_time
-                    }
+                    chunk_paths = _single_chunk(audio_path)
                 
-                if self.logger:
-                    self.logger.info(f"Traducción completada en {elapsed_time:.2f} segundos")
-            else:
-                # Si hubo un error, devolver la información del error
-                error_msg = f"Error en la API de Groq: {response.status_code} - {response.text}"
-                if self.logger:
-                    self.logger.error(error_msg)
+                next_index = 0
+                async for chunk_path in chunk_paths:
+                    tasks.append(asyncio.create_task(
+                        self._transcribe_chunk(client, semaphore, chunk_path, model, language)
+                    ))
+                    # Entregar los fragmentos ya terminados sin esperar al resto de la división
+                    while next_index < len(tasks) and tasks[next_index].done():
+                        yield tasks[next_index].result()
+                        next_index += 1
                 
-                result = {
-                    "success": False,
-                    "error": error_msg,
-                    "status_code": response.status_code
-                }
-            
-            return result
+                for task in tasks[next_index:]:
+                    yield await task
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    async def transcribe_large_audio_async(self, audio_path, model="whisper-large-v3-turbo", language=None,
+                                           chunk_seconds=CHUNK_SECONDS, max_concurrency=MAX_CONCURRENT_CHUNKS):
+        """
+        Transcribe un audio de cualquier tamaño dividiéndolo en fragmentos.
+        
+        Usa ``iter_large_audio_transcription`` y une los segmentos desplazando
+        sus marcas de tiempo.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio a transcribir.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            chunk_seconds (int): Duración aproximada de cada fragmento.
+            max_concurrency (int): Número máximo de fragmentos enviados a la vez.
             
+        Returns:
+            dict: Resultado de la transcripción con el texto, los segmentos y metadatos.
+        """
+        start_time = time.perf_counter()
+        texts = []
+        segments = []
+        offset = 0.0
+        chunk_count = 0
+        
+        results = self.iter_large_audio_transcription(
+            audio_path, model=model, language=language,
+            chunk_seconds=chunk_seconds, max_concurrency=max_concurrency
+        )
+        try:
+            async for result in results:
+                if not result["success"]:
+                    return result
+                
+                # Unir el fragmento desplazando las marcas de tiempo de cada segmento
+                data = result.get("data", {})
+                texts.append(result["text"].strip())
+                for segment in data.get("segments", []):
+                    segment = dict(segment)
+                    segment["start"] = segment.get("start", 0.0) + offset
+                    segment["end"] = segment.get("end", 0.0) + offset
+                    segments.append(segment)
+                # Con "-c copy" los cortes caen en fotogramas clave: usar la duración real
+                offset += data.get("duration", chunk_seconds)
+                chunk_count += 1
         except Exception as e:
-            error_msg = f"Error en la traducción: {str(e)}"
+            error_msg = f"Error en la transcripción: {str(e)}"
             if self.logger:
                 self.logger.error(error_msg)
-                self.logger.exception("Detalles del error:")
+            return {"success": False, "error": error_msg}
+        finally:
+            await results.aclose()
+        
+        text = " ".join(texts)
+        elapsed_time = time.perf_counter() - start_time
+        
+        if self.logger:
+            self.logger.info("Transcripción de %s completada en %.2f segundos (%d fragmento(s))",
+                             os.path.basename(audio_path), elapsed_time, chunk_count)
+        
+        return {
+            "success": True,
+            "text": text,
+            "data": {"text": text, "segments": segments, "duration": offset},
+            "model_used": model,
+            "duration_seconds": elapsed_time,
+            "chunks": chunk_count
+        }
+    
+    def transcribe_large_audio(self, audio_path, model="whisper-large-v3-turbo", language=None,
+                               chunk_seconds=CHUNK_SECONDS, max_concurrency=MAX_CONCURRENT_CHUNKS):
+        """
+        Versión síncrona de ``transcribe_large_audio_async``.
+        
+        Args:
+            audio_path (str): Ruta al archivo de audio a transcribir.
+            model (str): Modelo de Whisper a utilizar.
+            language (str, optional): Código de idioma (ej. "es", "en").
+            chunk_seconds (int): Duración aproximada de cada fragmento.
+            max_concurrency (int): Número máximo de fragmentos enviados a la vez.
             
-            return {
-                "success": False,
-                "error": error_msg
-            }
+        Returns:
+            dict: Resultado de la transcripción con el texto, los segmentos y metadatos.
+        """
+        return asyncio.run(self.transcribe_large_audio_async(
+            audio_path, model=model, language=language,
+            chunk_seconds=chunk_seconds, max_concurrency=max_concurrency
+        ))
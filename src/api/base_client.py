@@ -1,15 +1,21 @@
 """
-Módulo que define la clase base para los clientes de API.
+Módulo que define la interfaz base para los clientes de API.
 """
-from abc import ABC, abstractmethod
+from typing import Protocol
 
-class BaseAPIClient(ABC):
+class BaseAPIClient(Protocol):
     """
-    Clase base abstracta para los clientes de API.
-    Define la interfaz común que deben implementar todos los clientes.
+    Interfaz común que deben implementar todos los clientes de API.
+    
+    Se define como ``Protocol`` en lugar de ABC: no hay comprobaciones
+    ``isinstance`` en tiempo de ejecución, así que basta con la verificación
+    estática y se evita el registro de métodos abstractos al instanciar.
+    
+    Declara ``__slots__`` vacío para que las subclases puedan definir los suyos
+    y sus instancias no necesiten un ``__dict__``.
     """
+    __slots__ = ()
     
-    @abstractmethod
     def is_configured(self):
         """
         Verifica si el cliente está configurado correctamente.
@@ -19,7 +25,6 @@ class BaseAPIClient(ABC):
         """
         pass
     
-    @abstractmethod
     def set_api_key(self, api_key):
         """
         Establece la clave API para el cliente.
@@ -29,7 +34,6 @@ class BaseAPIClient(ABC):
         """
         pass
     
-    @abstractmethod
     def get_cached_response(self, model, messages, temperature, max_tokens):
         """
         Obtiene una respuesta cacheada para parámetros específicos.
@@ -45,8 +49,7 @@ class BaseAPIClient(ABC):
         """
         pass
     
-    @abstractmethod
-    def generate_streaming_response(self, model, messages, temperature, max_tokens, callback=None):
+    def generate_streaming_response(self, model, messages, temperature, max_tokens, callback=None, pending_stream=None):
         """
         Genera una respuesta en streaming para una experiencia más interactiva.
         
@@ -56,13 +59,13 @@ class BaseAPIClient(ABC):
             temperature (float): Temperatura para la generación.
             max_tokens (int): Número máximo de tokens en la respuesta.
             callback (callable, optional): Función de callback para cada fragmento de respuesta.
+            pending_stream (Future, optional): Futuro con un stream abierto de antemano.
             
         Returns:
-            str: Respuesta completa generada.
+            dict: Diccionario con la respuesta completa generada y las herramientas ejecutadas.
         """
         pass
         
-    @abstractmethod
     def generate_response_with_image(self, model, messages, image_data, temperature, max_tokens, callback=None):
         """
         Genera una respuesta basada en texto e imagen.
@@ -7,13 +7,31 @@ utilizando la API de Groq.
 """
 import os
 import json
+import asyncio
 import tempfile
-import re
+import functools
+import importlib.util
 import csv
 import io
-from datetime import datetime
+import time
+import zipfile
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import Dict, Any, List, Optional, Union, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependency opcional
+    orjson = None
+
+# Tabla de traducción que sustituye los caracteres no permitidos en nombres de archivo
+_UNSAFE_FILENAME_TABLE = str.maketrans({c: '_' for c in '\\/*?:"<>|'})
+
+# Nombres por defecto únicos dentro del proceso: instante de arranque + contador
+_FALLBACK_NAME_PREFIX = int(time.time())
+_FALLBACK_NAME_COUNTER = itertools.count()
+
 # Definiciones de tipos de archivos soportados
 FILE_TYPES = {
     'json': {
@@ -78,10 +96,150 @@ FILE_TYPES = {
         'description': 'Hoja de cálculo Excel',
         'content_type': 'array',  # Array de arrays o array de objetos
         'binary': True,
+        'streaming': True,  # Admite iterables/generadores de filas (modo write-only de openpyxl)
         'requires_library': 'openpyxl'
     }
 }
 
+# Campos constantes de la respuesta de éxito para cada tipo de archivo
+_SUCCESS_TEMPLATES = {
+    file_type: {"success": True, "file_type": file_type, "mime_type": config['mime_type']}
+    for file_type, config in FILE_TYPES.items()
+}
+
+# Mapeo de extensiones a tipos de archivo
+EXTENSION_TO_TYPE = {config['extension']: file_type for file_type, config in FILE_TYPES.items()}
+
+# Número de caracteres iniciales que se examinan para detectar el tipo por contenido
+DETECTION_HEAD_SIZE = 4096
+
+# Inicios de contenido que identifican un script Python
+_PYTHON_PREFIXES = ('import ', 'def ', 'class ')
+
+# Tamaño del buffer de escritura para la serialización JSON por fragmentos
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Flags de apertura para la escritura directa sobre descriptor (O_CLOEXEC solo existe en POSIX)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+
+# Tamaño a partir del cual se preasigna el archivo completo antes de escribirlo
+PREALLOCATE_THRESHOLD = 1 << 20
+
+class RawJSON(bytes):
+    """
+    Fragmento JSON ya codificado (UTF-8 válido) que se inserta en la salida sin volver a
+    serializarse. Permite reutilizar subestructuras repetidas ya codificadas.
+    
+    El llamador es responsable de que el contenido sea JSON válido. Con versiones de
+    orjson que incluyen ``orjson.Fragment`` los bytes se copian tal cual; en otro caso
+    se decodifican y se vuelven a codificar para mantener una salida correcta.
+    """
+    __slots__ = ()
+
+_ORJSON_FRAGMENT = getattr(orjson, 'Fragment', None) if orjson is not None else None
+
+def _json_default(obj: Any) -> Any:
+    """
+    Serializa los tipos no nativos admitidos en el contenido JSON (``RawJSON``).
+    
+    Args:
+        obj (Any): Objeto que el codificador no sabe serializar.
+        
+    Returns:
+        Any: Representación serializable del objeto.
+    """
+    if isinstance(obj, RawJSON):
+        if _ORJSON_FRAGMENT is not None:
+            return _ORJSON_FRAGMENT(bytes(obj))
+        return json.loads(obj)
+    raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+# Codificadores JSON reutilizados cuando orjson no está disponible. El compacto usa
+# los separadores mínimos; el legible se emplea solo cuando se pide explícitamente
+_COMPACT_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_json_default)
+_PRETTY_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=_json_default)
+
+# Número máximo de archivos que se escriben en paralelo
+MAX_CONCURRENT_FILES = 8
+
+@functools.lru_cache(maxsize=None)
+def get_file_executor():
+    """
+    Obtiene el pool de hilos compartido para la escritura concurrente de archivos.
+    
+    Returns:
+        ThreadPoolExecutor: Pool limitado a ``MAX_CONCURRENT_FILES`` hilos.
+    """
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FILES, thread_name_prefix="metanoia-files")
+
+@functools.lru_cache(maxsize=None)
+def _get_workbook_class():
+    """
+    Importa ``openpyxl`` la primera vez que se necesita y conserva la clase ``Workbook``.
+    
+    Returns:
+        type: Clase ``openpyxl.Workbook``.
+    """
+    from openpyxl import Workbook
+    return Workbook
+
+# Fragmentos de esquema comunes a todas las herramientas (compartidos, no modificar)
+_FILENAME_PROPERTY = {
+    "type": "string",
+    "description": "Nombre del archivo a generar (sin extensión)"
+}
+_REQUIRED_PARAMETERS = ["content", "filename"]
+_PRETTY_PROPERTY = {
+    "type": "boolean",
+    "description": "Si es true, el JSON se escribe indentado y legible; por defecto se escribe compacto"
+}
+
+def _build_tool_definition(file_type: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Construye la definición de herramienta para un tipo de archivo.
+    
+    Args:
+        file_type (str): Tipo de archivo (json, python, markdown, etc.).
+        config (Dict[str, Any]): Configuración del tipo en FILE_TYPES.
+        
+    Returns:
+        Dict[str, Any]: Definición de la herramienta en el formato de Groq.
+    """
+    # Determinar el tipo de contenido para el parámetro
+    content_schema = {
+        "description": f"El contenido del archivo {file_type}"
+    }
+    
+    if config['content_type'] == 'object':
+        content_schema["type"] = "object"
+    elif config['content_type'] == 'array':
+        content_schema["type"] = "array"
+    else:  # string por defecto
+        content_schema["type"] = "string"
+    
+    properties = {
+        "content": content_schema,
+        "filename": _FILENAME_PROPERTY
+    }
+    if file_type == 'json':
+        properties["pretty"] = _PRETTY_PROPERTY
+    
+    return {
+        "type": "function",
+        "function": {
+            "name": f"generate_{file_type}_file",
+            "description": f"Genera un archivo {file_type.upper()} ({config['extension']}) - {config['description']}",
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": _REQUIRED_PARAMETERS
+            }
+        }
+    }
+
+# Definiciones de herramientas construidas una sola vez al importar el módulo
+TOOL_DEFINITIONS = {file_type: _build_tool_definition(file_type, config) for file_type, config in FILE_TYPES.items()}
+
 class FileGenerator:
     """
     Clase para generar archivos en diferentes formatos utilizando herramientas de Groq.
@@ -106,15 +264,36 @@ class FileGenerator:
         self.logger = logger
         
         # Crear directorio temporal si no existe
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
+        os.makedirs(self.temp_dir, exist_ok=True)
+        
+        # Prefijo de ruta precalculado (directorio + separador) para construir rutas por concatenación
+        self._path_prefix = os.path.join(self.temp_dir, '')
         
         # Verificar disponibilidad de bibliotecas opcionales
         self.available_libraries = self._check_optional_libraries()
+        
+        # Tipos utilizables con las bibliotecas disponibles; las herramientas y funciones
+        # se calculan una sola vez por instancia
+        self.supported_types = [
+            file_type for file_type, config in FILE_TYPES.items()
+            if not config.get('requires_library') or config['requires_library'] in self.available_libraries
+        ]
+        self._tools_definitions = [TOOL_DEFINITIONS[file_type] for file_type in self.supported_types]
+        self._available_functions = {
+            f"generate_{file_type}_file": functools.partial(self.generate_file, file_type=file_type)
+            for file_type in self.supported_types
+        }
+        
+        # Extensión y función de guardado (ya enlazada) de cada tipo soportado, para
+        # resolver cada llamada con una única búsqueda
+        self._type_specs = {
+            file_type: (FILE_TYPES[file_type]['extension'], self._SAVERS.get(file_type, FileGenerator._save_text_file).__get__(self))
+            for file_type in self.supported_types
+        }
             
         if self.logger:
-            self.logger.info(f"FileGenerator inicializado con directorio temporal: {self.temp_dir}")
-            self.logger.info(f"Bibliotecas opcionales disponibles: {', '.join(self.available_libraries) if self.available_libraries else 'ninguna'}")
+            self.logger.info("FileGenerator inicializado con directorio temporal: %s", self.temp_dir)
+            self.logger.info("Bibliotecas opcionales disponibles: %s", ', '.join(self.available_libraries) or 'ninguna')
     
     def _check_optional_libraries(self) -> List[str]:
         """
@@ -125,11 +304,11 @@ class FileGenerator:
         """
         available = []
         
-        # Verificar openpyxl para archivos Excel
-        try:
-            import openpyxl
+        # Verificar openpyxl para archivos Excel sin importarlo: el módulo solo se
+        # carga la primera vez que se genera un archivo Excel
+        if importlib.util.find_spec('openpyxl') is not None:
             available.append('openpyxl')
-        except ImportError:
+        else:
             if self.logger:
                 self.logger.warning("Biblioteca 'openpyxl' no disponible. La generación de archivos Excel estará deshabilitada.")
         
@@ -138,77 +317,25 @@ class FileGenerator:
     def get_tools_definitions(self) -> List[Dict[str, Any]]:
         """
         Obtiene las definiciones de herramientas para la generación de archivos.
-        Genera dinámicamente las definiciones basadas en los tipos de archivos soportados.
+        Solo incluye los tipos de archivos soportados por las bibliotecas disponibles.
+        La lista es compartida entre llamadas y no debe modificarse.
         
         Returns:
             List[Dict[str, Any]]: Lista de definiciones de herramientas.
         """
-        tools = []
-        
-        # Generar definiciones para cada tipo de archivo soportado
-        for file_type, config in FILE_TYPES.items():
-            # Omitir tipos que requieren bibliotecas no disponibles
-            if config.get('requires_library') and config['requires_library'] not in self.available_libraries:
-                continue
-                
-            # Determinar el tipo de contenido para el parámetro
-            content_schema = {
-                "description": f"El contenido del archivo {file_type}"
-            }
-            
-            if config['content_type'] == 'object':
-                content_schema["type"] = "object"
-            elif config['content_type'] == 'array':
-                content_schema["type"] = "array"
-            else:  # string por defecto
-                content_schema["type"] = "string"
-            
-            # Crear la definición de la herramienta
-            tool = {
-                "type": "function",
-                "function": {
-                    "name": f"generate_{file_type}_file",
-                    "description": f"Genera un archivo {file_type.upper()} ({config['extension']}) - {config['description']}",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "content": content_schema,
-                            "filename": {
-                                "type": "string",
-                                "description": "Nombre del archivo a generar (sin extensión)"
-                            }
-                        },
-                        "required": ["content", "filename"]
-                    }
-                }
-            }
-            
-            tools.append(tool)
-        
-        return tools
+        return self._tools_definitions
     
     def get_available_functions(self) -> Dict[str, callable]:
         """
         Obtiene un diccionario con las funciones disponibles para las herramientas.
-        Genera dinámicamente el mapeo de funciones basado en los tipos de archivos soportados.
+        El mapeo se construye una sola vez en la inicialización.
         
         Returns:
             Dict[str, callable]: Diccionario con las funciones disponibles.
         """
-        functions = {}
-        
-        # Añadir funciones para cada tipo de archivo soportado
-        for file_type, config in FILE_TYPES.items():
-            # Omitir tipos que requieren bibliotecas no disponibles
-            if config.get('requires_library') and config['requires_library'] not in self.available_libraries:
-                continue
-                
-            # Usar el método genérico para todos los tipos
-            functions[f"generate_{file_type}_file"] = lambda content, filename, ft=file_type: self.generate_file(content, filename, ft)
-        
-        return functions
+        return self._available_functions
     
-    def generate_file(self, content: Any, filename: str, file_type: str) -> Dict[str, Any]:
+    def generate_file(self, content: Any, filename: str, file_type: str, pretty: bool = False) -> Dict[str, Any]:
         """
         Método genérico para generar archivos de cualquier tipo soportado.
         
@@ -216,56 +343,36 @@ class FileGenerator:
             content (Any): Contenido del archivo (puede ser string, dict, list, etc. según el tipo).
             filename (str): Nombre del archivo sin extensión.
             file_type (str): Tipo de archivo a generar (json, python, markdown, etc.).
+            pretty (bool): Solo para JSON; si es True se escribe indentado en lugar de compacto.
             
         Returns:
             Dict[str, Any]: Información del archivo generado.
         """
-        # Verificar que el tipo de archivo esté soportado
-        if file_type not in FILE_TYPES:
-            error_msg = f"Tipo de archivo no soportado: {file_type}"
-            if self.logger:
-                self.logger.error(error_msg)
+        safe_filename, error_msg = self._prepare_filename(filename, file_type)
+        if error_msg:
             return {"success": False, "error": error_msg}
         
-        # Verificar bibliotecas requeridas
-        if FILE_TYPES[file_type].get('requires_library') and FILE_TYPES[file_type]['requires_library'] not in self.available_libraries:
-            error_msg = f"No se puede generar archivo {file_type}. Biblioteca requerida '{FILE_TYPES[file_type]['requires_library']}' no disponible."
-            if self.logger:
-                self.logger.error(error_msg)
-            return {"success": False, "error": error_msg}
-        
-        # Asegurar que el nombre del archivo sea seguro
-        safe_filename = self._sanitize_filename(filename)
-        
-        # Añadir extensión si no la tiene
-        extension = FILE_TYPES[file_type]['extension']
-        if not safe_filename.lower().endswith(extension.lower()):
-            safe_filename += extension
-        
         # Crear ruta completa
-        file_path = os.path.join(self.temp_dir, safe_filename)
+        file_path = self._path_prefix + safe_filename
         
         try:
-            # Procesar y guardar el contenido según el tipo de archivo
+            # Procesar y guardar el contenido según el tipo de archivo.
+            # Los tipos de texto (python, markdown, text, html, css, js) usan el guardado plano.
+            saver = self._type_specs[file_type][1]
             if file_type == 'json':
-                self._save_json_file(content, file_path)
-            elif file_type == 'csv':
-                self._save_csv_file(content, file_path)
-            elif file_type == 'excel':
-                self._save_excel_file(content, file_path)
+                saver(content, file_path, pretty)
             else:
-                # Para archivos de texto (python, markdown, text, html, css, js)
-                self._save_text_file(content, file_path)
+                saver(content, file_path)
             
             if self.logger:
-                self.logger.info(f"Archivo {file_type.upper()} generado: {file_path}")
+                self.logger.info("Archivo %s generado: %s", file_type.upper(), file_path)
             
+            # La parte fija de la respuesta se precalcula por tipo; el nombre saneado
+            # ya no contiene separadores, así que coincide con el basename de la ruta
             return {
-                "success": True,
+                **_SUCCESS_TEMPLATES[file_type],
                 "file_path": file_path,
-                "file_type": file_type,
-                "file_name": os.path.basename(file_path),
-                "mime_type": FILE_TYPES[file_type]['mime_type'],
+                "file_name": safe_filename,
                 "message": f"Archivo {file_type.upper()} '{safe_filename}' generado correctamente."
             }
             
@@ -280,228 +387,348 @@ class FileGenerator:
                 "error": error_msg
             }
     
-    def _save_json_file(self, content: Dict[str, Any], file_path: str) -> None:
+    def generate_bytes(self, content: Any, filename: str, file_type: str, pretty: bool = False) -> Dict[str, Any]:
         """
-        Guarda contenido en formato JSON.
+        Genera el contenido de un archivo en memoria, sin escribirlo en disco.
+        
+        Útil cuando el archivo solo se va a ofrecer como descarga y no necesita
+        una ruta en el sistema de archivos.
         
         Args:
-            content (Dict[str, Any]): Contenido a guardar.
-            file_path (str): Ruta del archivo.
+            content (Any): Contenido del archivo (puede ser string, dict, list, etc. según el tipo).
+            filename (str): Nombre del archivo sin extensión.
+            file_type (str): Tipo de archivo a generar (json, python, markdown, etc.).
+            pretty (bool): Solo para JSON; si es True se escribe indentado en lugar de compacto.
+            
+        Returns:
+            Dict[str, Any]: Información del archivo generado; ``data`` contiene los bytes.
         """
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(content, f, indent=2, ensure_ascii=False)
+        safe_filename, error_msg = self._prepare_filename(filename, file_type)
+        if error_msg:
+            return {"success": False, "error": error_msg}
+        
+        try:
+            data = self._serialize(content, file_type, pretty)
+        except Exception as e:
+            error_msg = f"Error al generar archivo {file_type}: {str(e)}"
+            if self.logger:
+                self.logger.error(error_msg)
+            return {"success": False, "error": error_msg}
+        
+        return {
+            **_SUCCESS_TEMPLATES[file_type],
+            "data": data,
+            "file_name": safe_filename,
+            "message": f"Archivo {file_type.upper()} '{safe_filename}' generado correctamente."
+        }
     
-    def _save_text_file(self, content: str, file_path: str) -> None:
+    def _prepare_filename(self, filename: str, file_type: str) -> Tuple[Optional[str], Optional[str]]:
         """
-        Guarda contenido como texto plano.
+        Valida el tipo de archivo y construye el nombre final saneado y con extensión.
         
         Args:
-            content (str): Contenido a guardar.
-            file_path (str): Ruta del archivo.
+            filename (str): Nombre del archivo sin extensión.
+            file_type (str): Tipo de archivo a generar.
+            
+        Returns:
+            Tuple[Optional[str], Optional[str]]: ``(nombre, None)`` si es válido o
+                ``(None, mensaje_de_error)`` en caso contrario.
         """
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        spec = self._type_specs.get(file_type)
+        if spec is None:
+            # Distinguir entre un tipo desconocido y uno que requiere una biblioteca ausente
+            if file_type not in FILE_TYPES:
+                error_msg = f"Tipo de archivo no soportado: {file_type}"
+            else:
+                error_msg = f"No se puede generar archivo {file_type}. Biblioteca requerida '{FILE_TYPES[file_type]['requires_library']}' no disponible."
+            if self.logger:
+                self.logger.error(error_msg)
+            return None, error_msg
+        
+        # Asegurar que el nombre del archivo sea seguro
+        safe_filename = self._sanitize_filename(filename)
+        
+        # Añadir extensión si no la tiene (las extensiones de FILE_TYPES ya están en minúsculas)
+        extension = spec[0]
+        if not safe_filename.lower().endswith(extension):
+            safe_filename += extension
+        
+        return safe_filename, None
     
-    def _save_csv_file(self, content: Union[List[List[Any]], List[Dict[str, Any]]], file_path: str) -> None:
+    def _serialize(self, content: Any, file_type: str, pretty: bool = False) -> bytes:
         """
-        Guarda contenido en formato CSV.
+        Serializa el contenido a los bytes finales del archivo según su tipo.
         
         Args:
-            content (Union[List[List[Any]], List[Dict[str, Any]]]): Datos para el CSV.
-                Puede ser una lista de listas (filas y columnas) o una lista de diccionarios.
-            file_path (str): Ruta del archivo.
+            content (Any): Contenido del archivo.
+            file_type (str): Tipo de archivo.
+            pretty (bool): Solo para JSON; si es True se indenta la salida.
+            
+        Returns:
+            bytes: Contenido codificado.
         """
-        with open(file_path, 'w', encoding='utf-8', newline='') as f:
-            # Determinar si es una lista de diccionarios o una lista de listas
-            if content and isinstance(content[0], dict):
-                # Lista de diccionarios
-                fieldnames = list(content[0].keys())
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(content)
-            else:
-                # Lista de listas
-                writer = csv.writer(f)
-                writer.writerows(content)
+        if file_type == 'json':
+            if orjson is not None:
+                return orjson.dumps(
+                    content,
+                    default=_json_default,
+                    option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+                )
+            encoder = _PRETTY_JSON_ENCODER if pretty else _COMPACT_JSON_ENCODER
+            return encoder.encode(content).encode('utf-8')
+        if file_type == 'csv':
+            return self._encode_csv(content)
+        if file_type == 'excel':
+            buffer = io.BytesIO()
+            self._save_excel_file(content, buffer)
+            return buffer.getvalue()
+        return content.encode('utf-8')
     
-    def _save_excel_file(self, content: Union[List[List[Any]], Dict[str, List[List[Any]]]], file_path: str) -> None:
+    def generate_many(self, specs: List[Tuple[Any, str, str]]) -> List[Dict[str, Any]]:
         """
-        Guarda contenido en formato Excel (XLSX).
+        Genera varios archivos en paralelo, solapando la serialización de uno con la
+        escritura en disco de los demás.
         
         Args:
-            content: Puede ser una lista de listas (una hoja) o un diccionario de listas de listas (múltiples hojas).
-            file_path (str): Ruta del archivo.
-        """
-        try:
-            import openpyxl
-            from openpyxl import Workbook
-            
-            wb = Workbook()
-            
-            # Si es un diccionario, cada clave es una hoja
-            if isinstance(content, dict):
-                # Eliminar la hoja por defecto
-                default_sheet = wb.active
-                wb.remove(default_sheet)
-                
-                # Crear cada hoja con su contenido
-                for sheet_name, sheet_data in content.items():
-                    ws = wb.create_sheet(title=sheet_name)
-                    for row_idx, row in enumerate(sheet_data, 1):
-                        for col_idx, value in enumerate(row, 1):
-                            ws.cell(row=row_idx, column=col_idx, value=value)
-            else:
-                # Una sola hoja con los datos
-                ws = wb.active
-                for row_idx, row in enumerate(content, 1):
-                    for col_idx, value in enumerate(row, 1):
-                        ws.cell(row=row_idx, column=col_idx, value=value)
-            
-            wb.save(file_path)
+            specs (List[Tuple[Any, str, str]]): Tuplas ``(content, filename, file_type)``.
             
-        except ImportError:
-            raise ImportError("La biblioteca 'openpyxl' es necesaria para generar archivos Excel.")
+        Returns:
+            List[Dict[str, Any]]: Información de cada archivo, en el mismo orden que ``specs``.
+        """
+        if len(specs) <= 1:
+            return [self.generate_file(*spec) for spec in specs]
+        return list(get_file_executor().map(lambda spec: self.generate_file(*spec), specs))
     
-    def generate_python_file(self, content: str, filename: str) -> Dict[str, Any]:
+    async def generate_many_async(self, specs: List[Tuple[Any, str, str]]) -> List[Dict[str, Any]]:
         """
-        Genera un archivo Python y devuelve la información para su descarga.
+        Versión asíncrona de ``generate_many`` para usar desde un bucle de eventos.
         
         Args:
-            content (str): Contenido del archivo Python (código).
-            filename (str): Nombre del archivo sin extensión.
+            specs (List[Tuple[Any, str, str]]): Tuplas ``(content, filename, file_type)``.
             
         Returns:
-            Dict[str, Any]: Información del archivo generado.
+            List[Dict[str, Any]]: Información de cada archivo, en el mismo orden que ``specs``.
         """
-        # Asegurar que el nombre del archivo sea seguro
-        safe_filename = self._sanitize_filename(filename)
+        loop = asyncio.get_running_loop()
+        executor = get_file_executor()
+        return await asyncio.gather(*[
+            loop.run_in_executor(executor, functools.partial(self.generate_file, *spec))
+            for spec in specs
+        ])
+    
+    def generate_archive(self, specs: List[Tuple[Any, str, str]], archive_name: str) -> Dict[str, Any]:
+        """
+        Genera varios archivos y los empaqueta en un único ZIP para ofrecer una sola descarga.
         
-        # Añadir extensión si no la tiene
-        if not safe_filename.endswith('.py'):
-            safe_filename += '.py'
+        Los archivos se escriben en paralelo con ``generate_many`` y después se añaden al
+        ZIP sin compresión, de modo que el coste extra es una única copia secuencial.
         
-        # Crear ruta completa
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        file_path = os.path.join(self.temp_dir, f"{safe_filename}")
+        Args:
+            specs (List[Tuple[Any, str, str]]): Tuplas ``(content, filename, file_type)``.
+            archive_name (str): Nombre del archivo ZIP sin extensión.
+            
+        Returns:
+            Dict[str, Any]: Información del ZIP generado; ``files`` contiene el resultado
+                de cada archivo individual.
+        """
+        results = self.generate_many(specs)
+        generated = [result for result in results if result.get("success")]
+        if not generated:
+            return {"success": False, "error": "No se generó ningún archivo para empaquetar.", "files": results}
+        
+        safe_name = self._sanitize_filename(archive_name)
+        if not safe_name.lower().endswith('.zip'):
+            safe_name += '.zip'
+        archive_path = self._path_prefix + safe_name
         
         try:
-            # Guardar contenido en el archivo
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            if self.logger:
-                self.logger.info(f"Archivo Python generado: {file_path}")
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "file_type": "python",
-                "file_name": os.path.basename(file_path),
-                "message": f"Archivo Python '{safe_filename}' generado correctamente."
-            }
+            with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+                for result in generated:
+                    archive.write(result["file_path"], arcname=result["file_name"])
         except Exception as e:
-            error_msg = f"Error al generar archivo Python: {str(e)}"
+            error_msg = f"Error al empaquetar archivos: {str(e)}"
             if self.logger:
                 self.logger.error(error_msg)
-            
-            return {
-                "success": False,
-                "error": error_msg
-            }
+            return {"success": False, "error": error_msg, "files": results}
+        
+        if self.logger:
+            self.logger.info("Archivo ZIP generado con %d archivos: %s", len(generated), archive_path)
+        
+        return {
+            "success": True,
+            "file_path": archive_path,
+            "file_type": "zip",
+            "file_name": safe_name,
+            "mime_type": "application/zip",
+            "message": f"Archivo ZIP '{safe_name}' generado correctamente con {len(generated)} archivos.",
+            "files": results
+        }
     
-    def generate_markdown_file(self, content: str, filename: str) -> Dict[str, Any]:
+    def _save_json_file(self, content: Dict[str, Any], file_path: str, pretty: bool = False) -> None:
         """
-        Genera un archivo Markdown y devuelve la información para su descarga.
+        Guarda contenido en formato JSON.
         
         Args:
-            content (str): Contenido del archivo Markdown.
-            filename (str): Nombre del archivo sin extensión.
-            
-        Returns:
-            Dict[str, Any]: Información del archivo generado.
+            content (Dict[str, Any]): Contenido a guardar.
+            file_path (str): Ruta del archivo.
+            pretty (bool): Si es True se indenta la salida; por defecto se escribe compacta.
         """
-        # Asegurar que el nombre del archivo sea seguro
-        safe_filename = self._sanitize_filename(filename)
-        
-        # Añadir extensión si no la tiene
-        if not safe_filename.endswith('.md'):
-            safe_filename += '.md'
+        # Con orjson se serializa a bytes de una vez y se escribe con una sola llamada
+        if orjson is not None:
+            self._write_bytes(file_path, self._serialize(content, 'json', pretty))
+            return
+        
+        # Sin orjson se serializa por fragmentos sobre un buffer grande, sin materializar
+        # el documento completo en memoria
+        encoder = _PRETTY_JSON_ENCODER if pretty else _COMPACT_JSON_ENCODER
+        with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            write = f.write
+            for chunk in encoder.iterencode(content):
+                write(chunk.encode('utf-8'))
+    
+    def _save_text_file(self, content: str, file_path: str) -> None:
+        """
+        Guarda contenido como texto plano.
         
-        # Crear ruta completa
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        file_path = os.path.join(self.temp_dir, f"{safe_filename}")
+        Args:
+            content (str): Contenido a guardar.
+            file_path (str): Ruta del archivo.
+        """
+        self._write_bytes(file_path, content.encode('utf-8'))
+    
+    @staticmethod
+    def _write_bytes(file_path: str, data: bytes) -> None:
+        """
+        Escribe bytes en un archivo directamente sobre el descriptor, sin capa de texto.
         
+        Args:
+            file_path (str): Ruta del archivo.
+            data (bytes): Contenido ya codificado.
+        """
+        fd = os.open(file_path, _WRITE_FLAGS, 0o644)
         try:
-            # Guardar contenido en el archivo
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            if self.logger:
-                self.logger.info(f"Archivo Markdown generado: {file_path}")
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "file_type": "markdown",
-                "file_name": os.path.basename(file_path),
-                "message": f"Archivo Markdown '{safe_filename}' generado correctamente."
-            }
-        except Exception as e:
-            error_msg = f"Error al generar archivo Markdown: {str(e)}"
-            if self.logger:
-                self.logger.error(error_msg)
-            
-            return {
-                "success": False,
-                "error": error_msg
-            }
+            # Reservar el tamaño final de antemano para archivos grandes (solo POSIX)
+            if len(data) >= PREALLOCATE_THRESHOLD and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, len(data))
+                except OSError:
+                    # Algunos sistemas de archivos no lo soportan; se escribe igualmente
+                    pass
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
     
-    def generate_text_file(self, content: str, filename: str) -> Dict[str, Any]:
+    def _save_csv_file(self, content: Union[List[List[Any]], List[Dict[str, Any]]], file_path: str) -> None:
         """
-        Genera un archivo de texto y devuelve la información para su descarga.
+        Guarda contenido en formato CSV.
         
         Args:
-            content (str): Contenido del archivo de texto.
-            filename (str): Nombre del archivo sin extensión.
+            content (Union[List[List[Any]], List[Dict[str, Any]]]): Datos para el CSV.
+                Puede ser una lista de listas (filas y columnas) o una lista de diccionarios.
+            file_path (str): Ruta del archivo.
+        """
+        # Construir el CSV en memoria y escribirlo como bytes de una sola vez
+        self._write_bytes(file_path, self._encode_csv(content))
+    
+    def _encode_csv(self, content: Union[List[List[Any]], List[Dict[str, Any]]]) -> bytes:
+        """
+        Codifica el contenido CSV en UTF-8.
+        
+        Args:
+            content (Union[List[List[Any]], List[Dict[str, Any]]]): Datos para el CSV.
             
         Returns:
-            Dict[str, Any]: Información del archivo generado.
+            bytes: Contenido CSV codificado en UTF-8.
         """
-        # Asegurar que el nombre del archivo sea seguro
-        safe_filename = self._sanitize_filename(filename)
+        return self._render_csv(content).encode('utf-8')
+    
+    @staticmethod
+    def _render_csv(content: Union[List[List[Any]], List[Dict[str, Any]]]) -> str:
+        """
+        Construye el texto CSV en memoria.
         
-        # Añadir extensión si no la tiene
-        if not safe_filename.endswith('.txt'):
-            safe_filename += '.txt'
+        Para listas de diccionarios las columnas son las claves de la primera fila; las
+        claves que falten en otras filas quedan vacías y una clave que no esté en la
+        primera fila produce un ``ValueError``, igual que ``csv.DictWriter``.
         
-        # Crear ruta completa
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        file_path = os.path.join(self.temp_dir, f"{safe_filename}")
+        Args:
+            content (Union[List[List[Any]], List[Dict[str, Any]]]): Datos para el CSV.
+            
+        Returns:
+            str: Contenido CSV.
+        """
+        buffer = io.StringIO(newline='')
+        
+        # Determinar si es una lista de diccionarios o una lista de listas
+        if content and isinstance(content[0], dict):
+            # Lista de diccionarios
+            first_keys = content[0].keys()
+            fieldnames = list(first_keys)
+            if fieldnames and all(isinstance(row, dict) and row.keys() == first_keys for row in content):
+                # Todas las filas tienen exactamente las mismas claves: extraer los
+                # valores con itemgetter (búsquedas en C) y escribir tuplas; con una
+                # sola columna itemgetter devuelve el valor suelto
+                getter = itemgetter(*fieldnames)
+                rows = map(getter, content) if len(fieldnames) > 1 else ((getter(row),) for row in content)
+                writer = csv.writer(buffer)
+                writer.writerow(fieldnames)
+                writer.writerows(rows)
+                return buffer.getvalue()
+            
+            # Filas con claves distintas: DictWriter rellena las que faltan y
+            # rechaza las que sobran
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(content)
+        else:
+            # Lista de listas
+            writer = csv.writer(buffer)
+            writer.writerows(content)
+        
+        return buffer.getvalue()
+    
+    def _save_excel_file(self, content: Union[List[List[Any]], Dict[str, List[List[Any]]]], file_path: str) -> None:
+        """
+        Guarda contenido en formato Excel (XLSX).
         
+        Args:
+            content: Puede ser una lista de listas (una hoja) o un diccionario de listas de listas (múltiples hojas).
+                Las filas pueden ser cualquier iterable (por ejemplo, un generador), ya que se escriben en streaming.
+            file_path (str or file-like): Ruta del archivo o buffer binario de destino.
+        """
         try:
-            # Guardar contenido en el archivo
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            Workbook = _get_workbook_class()
             
-            if self.logger:
-                self.logger.info(f"Archivo de texto generado: {file_path}")
+            # Modo de solo escritura: las filas se vuelcan a XML a medida que se añaden,
+            # sin construir en memoria un objeto por celda
+            wb = Workbook(write_only=True)
             
-            return {
-                "success": True,
-                "file_path": file_path,
-                "file_type": "text",
-                "file_name": os.path.basename(file_path),
-                "message": f"Archivo de texto '{safe_filename}' generado correctamente."
-            }
-        except Exception as e:
-            error_msg = f"Error al generar archivo de texto: {str(e)}"
-            if self.logger:
-                self.logger.error(error_msg)
+            # Si es un diccionario, cada clave es una hoja
+            if isinstance(content, dict):
+                for sheet_name, sheet_data in content.items():
+                    ws = wb.create_sheet(title=sheet_name)
+                    for row in sheet_data:
+                        ws.append(row)
+            else:
+                # Una sola hoja con los datos
+                ws = wb.create_sheet()
+                for row in content:
+                    ws.append(row)
             
-            return {
-                "success": False,
-                "error": error_msg
-            }
+            wb.save(file_path)
+            
+        except ImportError:
+            raise ImportError("La biblioteca 'openpyxl' es necesaria para generar archivos Excel.")
+    
+    # Función de guardado para los tipos que no son texto plano
+    _SAVERS = {
+        'json': _save_json_file,
+        'csv': _save_csv_file,
+        'excel': _save_excel_file,
+    }
     
     def _sanitize_filename(self, filename: str) -> str:
         """
@@ -514,7 +741,7 @@ class FileGenerator:
             str: Nombre de archivo sanitizado.
         """
         # Reemplazar caracteres no permitidos con guiones bajos
-        safe_name = re.sub(r'[\\/*?:"<>|]', '_', filename)
+        safe_name = filename.translate(_UNSAFE_FILENAME_TABLE)
         # Eliminar espacios al inicio y final
         safe_name = safe_name.strip()
         # Limitar la longitud del nombre
@@ -523,10 +750,30 @@ class FileGenerator:
             safe_name = name_part[:96] + ext_part if ext_part else name_part[:100]
         # Si está vacío, usar un nombre predeterminado
         if not safe_name:
-            safe_name = f"archivo_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            safe_name = f"archivo_{_FALLBACK_NAME_PREFIX}_{next(_FALLBACK_NAME_COUNTER)}"
         
         return safe_name
         
+    @staticmethod
+    def _is_json_text(text: str) -> bool:
+        """
+        Indica si una cadena contiene un documento JSON válido.
+        
+        Args:
+            text (str): Texto a comprobar.
+            
+        Returns:
+            bool: True si el texto se puede analizar como JSON.
+        """
+        try:
+            if orjson is not None:
+                orjson.loads(text)
+            else:
+                json.loads(text)
+        except ValueError:
+            return False
+        return True
+    
     def detect_file_type(self, content: Any, filename: str) -> str:
         """
         Detecta automáticamente el tipo de archivo basado en el contenido y nombre.
@@ -542,12 +789,10 @@ class FileGenerator:
         _, ext = os.path.splitext(filename)
         ext = ext.lower()
         
-        # Mapeo de extensiones a tipos de archivo
-        ext_to_type = {config['extension']: file_type for file_type, config in FILE_TYPES.items()}
-        
         # Si la extensión está en nuestro mapeo, usar ese tipo
-        if ext in ext_to_type:
-            return ext_to_type[ext]
+        file_type = EXTENSION_TO_TYPE.get(ext)
+        if file_type is not None:
+            return file_type
         
         # Si no hay extensión, intentar detectar por el contenido
         if not ext:
@@ -557,23 +802,34 @@ class FileGenerator:
             
             # Si es una cadena, intentar detectar por el contenido
             if isinstance(content, str):
+                # Basta con examinar el inicio del contenido para clasificarlo; así el
+                # coste no depende del tamaño y solo se pasa a minúsculas un fragmento
+                head = content[:DETECTION_HEAD_SIZE]
+                head_lower = head.lower()
+                has_braces = '{' in head and '}' in head
+                
+                # Detectar JSON serializado como cadena: solo se intenta el análisis
+                # (en C con orjson) si empieza como un objeto o un array
+                if head.lstrip()[:1] in ('{', '[') and self._is_json_text(content):
+                    return 'json'
+                
                 # Detectar Python
-                if content.startswith('import ') or content.startswith('def ') or content.startswith('class '):
+                if head.startswith(_PYTHON_PREFIXES):
                     return 'python'
                 # Detectar HTML
-                elif content.strip().startswith('<') and ('<html' in content.lower() or '<!doctype html' in content.lower()):
+                elif head.lstrip().startswith('<') and ('<html' in head_lower or '<!doctype html' in head_lower):
                     return 'html'
                 # Detectar CSS
-                elif '{' in content and '}' in content and (':' in content or '@media' in content):
+                elif has_braces and (':' in head or '@media' in head):
                     return 'css'
                 # Detectar JavaScript
-                elif ('function ' in content or 'const ' in content or 'let ' in content) and ('{' in content and '}' in content):
+                elif has_braces and ('function ' in head or 'const ' in head or 'let ' in head):
                     return 'javascript'
                 # Detectar Markdown
-                elif content.startswith('#') or '**' in content or '```' in content:
+                elif head.startswith('#') or '**' in head or '```' in head:
                     return 'markdown'
                 # Detectar CSV
-                elif ',' in content and ('\n' in content or '\r' in content):
+                elif ',' in head and ('\n' in head or '\r' in head):
                     return 'csv'
             
             # Por defecto, texto plano
@@ -1,18 +1,22 @@
 """Procesamiento básico de archivos para MetanoIA."""
 
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
 from src.utils.file_utils import (
+    iter_text_chunks,
     split_text_by_tokens,
     summarize_text,
-    read_pdf,
     read_text,
     read_json,
+    summarize_bytes,
+    summarize_pdf,
 )
 
 
 class FileProcessor:
     """Clase para operaciones comunes sobre archivos de texto y datos."""
 
+    __slots__ = ("max_tokens", "logger", "_handlers")
+
     def __init__(self, max_tokens: int = 200, logger=None):
         """Inicializa el procesador con un límite de tokens.
 
@@ -22,6 +26,12 @@ class FileProcessor:
         """
         self.max_tokens = max_tokens
         self.logger = logger
+        # Tabla de despacho por tipo de archivo, construida una sola vez
+        self._handlers = {
+            "pdf": self.leer_pdf,
+            "txt": self.leer_txt,
+            "json": self.leer_json,
+        }
 
     def dividir_en_fragmentos(self, texto: str) -> List[str]:
         """Divide un texto largo en fragmentos manejables.
@@ -34,6 +44,17 @@ class FileProcessor:
         """
         return split_text_by_tokens(texto, self.max_tokens)
 
+    def iterar_fragmentos(self, texto: str) -> Iterator[str]:
+        """Recorre los fragmentos de un texto largo sin materializarlos todos.
+
+        Args:
+            texto: Texto a dividir.
+
+        Yields:
+            Fragmentos que no superan ``self.max_tokens`` tokens.
+        """
+        return iter_text_chunks(texto, self.max_tokens)
+
     def resumir(self, texto: str) -> str:
         """Genera un resumen simple del texto si es demasiado extenso.
 
@@ -48,18 +69,23 @@ class FileProcessor:
     def leer_pdf(self, data: bytes) -> str:
         """Extrae texto de un archivo PDF."""
 
-        text = read_pdf(data)
+        # Solo se extraen las páginas necesarias para el resumen
+        summary = summarize_pdf(data, self.max_tokens)
         if self.logger:
             self.logger.info("PDF procesado")
-        return self.resumir(text)
+        return summary
 
     def leer_txt(self, data: bytes | str) -> str:
         """Procesa un archivo de texto."""
 
-        text = read_text(data)
+        # Los datos binarios se resumen decodificando solo lo necesario
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            summary = summarize_bytes(data, self.max_tokens)
+        else:
+            summary = self.resumir(read_text(data))
         if self.logger:
             self.logger.info("Archivo TXT procesado")
-        return self.resumir(text)
+        return summary
 
     def leer_json(self, data: bytes | str) -> Dict[str, Any]:
         """Procesa un archivo JSON y devuelve el diccionario correspondiente."""
@@ -72,17 +98,12 @@ class FileProcessor:
     def process_file(self, data: bytes | str, file_type: str) -> Dict[str, Any]:
         """Procesa un archivo según su tipo."""
 
+        handler = self._handlers.get(file_type)
+        if handler is None:
+            return {"success": False, "error": "Tipo de archivo no soportado"}
+
         try:
-            if file_type == "pdf":
-                content = self.leer_pdf(data)
-            elif file_type == "txt":
-                content = self.leer_txt(data)
-            elif file_type == "json":
-                content = self.leer_json(data)
-            else:
-                return {"success": False, "error": "Tipo de archivo no soportado"}
-
-            return {"success": True, "content": content, "file_type": file_type}
+            return {"success": True, "content": handler(data), "file_type": file_type}
 
         except Exception as e:
             if self.logger:
@@ -3,16 +3,68 @@ Módulo para interactuar con la API de Groq.
 """
 import os
 import time
+import logging
 import json
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 from groq import Groq
 from src.api.base_client import BaseAPIClient
+from src.utils.response_cache import ResponseCache, canonical_json_bytes
+
+try:
+    import h2  # noqa: F401 - necesario para que httpx use HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Límites del pool de conexiones hacia api.groq.com
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Intervalo mínimo (segundos) entre actualizaciones del callback durante el streaming
+CALLBACK_INTERVAL = 0.05
+
+@st.cache_resource(show_spinner=False)
+def get_http_client():
+    """
+    Obtiene el cliente HTTP compartido por todas las instancias de Groq.
+    
+    Usa HTTP/2 si ``h2`` está instalado, de modo que las peticiones concurrentes
+    (chat, herramientas, transcripción) se multiplexan sobre una sola conexión.
+    
+    Returns:
+        httpx.Client: Cliente HTTP con pool de conexiones persistentes.
+    """
+    return httpx.Client(http2=HTTP2_AVAILABLE, limits=HTTP_POOL_LIMITS, timeout=HTTP_TIMEOUT)
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    """
+    Obtiene la caché de respuestas (memoria + disco) compartida entre ejecuciones.
+    
+    Returns:
+        ResponseCache: Instancia única de la caché de respuestas.
+    """
+    return ResponseCache(ttl=3600)
+
+@st.cache_resource(show_spinner=False)
+def get_tool_executor():
+    """
+    Obtiene el pool de hilos para ejecutar en paralelo varias llamadas a herramientas.
+    
+    Returns:
+        ThreadPoolExecutor: Pool compartido entre ejecuciones.
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="metanoia-tools")
 
 class GroqClient(BaseAPIClient):
     """
     Cliente para interactuar con la API de Groq.
     Implementa la interfaz definida en BaseAPIClient.
     """
+    __slots__ = ("api_key", "logger", "client", "_configured")
+    
     def __init__(self, api_key=None, logger=None):
         """
         Inicializa el cliente de Groq.
@@ -27,8 +79,18 @@ class GroqClient(BaseAPIClient):
         self.client = None
         
         if self.api_key:
-            self.client = Groq(api_key=self.api_key)
+            self.client = Groq(api_key=self.api_key, http_client=get_http_client())
+        
+        # Estado de configuración precalculado (se actualiza en set_api_key)
+        self._configured = self.client is not None and self.api_key is not None
         
+    @property
+    def configured(self):
+        """
+        bool: True si el cliente está configurado (lectura directa, sin recalcular).
+        """
+        return self._configured
+    
     def is_configured(self):
         """
         Verifica si el cliente está configurado correctamente.
@@ -36,44 +98,60 @@ class GroqClient(BaseAPIClient):
         Returns:
             bool: True si el cliente está configurado, False en caso contrario.
         """
-        return self.client is not None and self.api_key is not None
+        return self._configured
     
     def set_api_key(self, api_key):
         """
         Establece la clave API y reconfigura el cliente.
         
+        Si la clave no cambia se conserva el cliente actual; si cambia, se deriva
+        uno nuevo con ``with_options``, que reutiliza el mismo cliente HTTP y sus
+        conexiones abiertas en lugar de construir la instancia desde cero.
+        
         Args:
             api_key (str): Clave API de Groq.
         """
-        self.api_key = api_key
         os.environ["GROQ_API_KEY"] = api_key
-        self.client = Groq(api_key=self.api_key)
+        if self.client is None:
+            self.client = Groq(api_key=api_key, http_client=get_http_client())
+        elif api_key != self.api_key:
+            self.client = self.client.with_options(api_key=api_key)
+        self.api_key = api_key
+        self._configured = self.api_key is not None
         
         if self.logger:
             self.logger.info("API key configurada")
     
-    # Función cacheada para obtener respuestas que no cambiarán con los mismos parámetros
-    @st.cache_data(ttl=3600, show_spinner=False)
-    def _cached_api_call(self, model, messages_str, temperature, max_tokens):
+    def _cached_api_call(self, model, messages, temperature, max_tokens):
         """
         Realiza una llamada a la API con caché.
         
+        La respuesta se busca primero en la caché de dos niveles (LRU en memoria y
+        disco) con una clave hash de los parámetros; solo si no existe se llama
+        a la API y se guarda el resultado. Los mensajes se serializan una única vez
+        para calcular la clave y se envían tal cual a la API, sin volver a decodificarlos.
+        
         Args:
             model (str): ID del modelo a utilizar.
-            messages_str (str): Representación en string de los mensajes (para caché).
+            messages (list): Lista de mensajes para la conversación.
             temperature (float): Temperatura para la generación.
             max_tokens (int): Número máximo de tokens en la respuesta.
             
         Returns:
             str: Contenido de la respuesta o mensaje de error.
         """
+        cache = get_response_cache()
+        cache_key = cache.make_key(model, canonical_json_bytes(messages), temperature, max_tokens)
+        
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if self.logger:
+                self.logger.info("Respuesta obtenida de la caché para el modelo: %s", model)
+            return cached
+        
         try:
-            # Convertir la representación de string a lista de mensajes
-            import json
-            messages = json.loads(messages_str)
-            
             if self.logger:
-                self.logger.info(f"Llamada a API CACHEADA con modelo: {model}")
+                self.logger.info("Llamada a API CACHEADA con modelo: %s", model)
             
             start_time = time.time()
             
@@ -87,9 +165,11 @@ class GroqClient(BaseAPIClient):
             elapsed_time = time.time() - start_time
             
             if self.logger:
-                self.logger.info(f"Respuesta cacheada recibida en {elapsed_time:.2f} segundos")
+                self.logger.info("Respuesta cacheada recibida en %.2f segundos", elapsed_time)
             
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            cache.set(cache_key, content)
+            return content
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error en llamada API cacheada: {str(e)}")
@@ -112,21 +192,44 @@ class GroqClient(BaseAPIClient):
             return "Error: API no configurada. Por favor, proporciona una clave API."
         
         try:
-            # Convertir mensajes a string para la caché
-            import json
-            messages_str = json.dumps(messages)
-            
             if self.logger:
-                self.logger.info(f"Preparando llamada cacheada: {model}, temperatura: {temperature}, max_tokens: {max_tokens}")
+                self.logger.info("Preparando llamada cacheada: %s, temperatura: %s, max_tokens: %s", model, temperature, max_tokens)
             
             # Usar la función cacheada
-            return self._cached_api_call(model, messages_str, temperature, max_tokens)
+            return self._cached_api_call(model, messages, temperature, max_tokens)
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error al preparar llamada cacheada: {str(e)}")
             return f"Error al llamar a la API: {str(e)}"
     
-    def generate_streaming_response(self, model, messages, temperature, max_tokens, callback=None):
+    def open_stream(self, model, messages, temperature, max_tokens):
+        """
+        Abre una conexión de streaming sin consumirla.
+        
+        Permite lanzar la petición por adelantado (por ejemplo, desde un hilo en
+        segundo plano) y consumirla después con ``generate_streaming_response``.
+        
+        Args:
+            model (str): ID del modelo a utilizar.
+            messages (list): Lista de mensajes para la conversación.
+            temperature (float): Temperatura para la generación.
+            max_tokens (int): Número máximo de tokens en la respuesta.
+            
+        Returns:
+            Stream: Iterador de fragmentos devuelto por el SDK de Groq.
+        """
+        if self.logger:
+            self.logger.info("Abriendo stream anticipado con modelo: %s", model)
+        
+        return self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+    
+    def generate_streaming_response(self, model, messages, temperature, max_tokens, callback=None, pending_stream=None):
         """
         Genera una respuesta en streaming para una experiencia más interactiva.
         
@@ -136,6 +239,8 @@ class GroqClient(BaseAPIClient):
             temperature (float): Temperatura para la generación.
             max_tokens (int): Número máximo de tokens en la respuesta.
             callback (callable, optional): Función de callback para cada fragmento de respuesta.
+            pending_stream (Future, optional): Futuro con un stream abierto de antemano
+                mediante ``open_stream``. Si se proporciona, no se realiza una nueva llamada.
             
         Returns:
             dict: Diccionario con la respuesta completa generada y las herramientas ejecutadas.
@@ -146,55 +251,73 @@ class GroqClient(BaseAPIClient):
         
         try:
             if self.logger:
-                self.logger.info(f"Iniciando llamada a API (streaming) con modelo: {model}")
-                self.logger.info(f"Parámetros: temperatura={temperature}, max_tokens={max_tokens}")
+                self.logger.info("Iniciando llamada a API (streaming) con modelo: %s", model)
+                self.logger.info("Parámetros: temperatura=%s, max_tokens=%s", temperature, max_tokens)
             
             start_time = time.time()
             
-            stream = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stream=True
-            )
+            if pending_stream is not None:
+                stream = pending_stream.result()
+            else:
+                stream = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True
+                )
             
             if self.logger:
                 self.logger.info("Conexión establecida, comenzando streaming...")
             
-            full_response = ""
+            # Acumular los fragmentos en una lista en lugar de concatenar cadenas
+            parts = []
             executed_tools = []
             chunk_count = 0
+            # Número de fragmentos ya entregados al callback y momento de la última entrega
+            rendered_parts = 0
+            last_callback = 0.0
             
             for chunk in stream:
                 chunk_count += 1
                 
-                # Procesar contenido del mensaje
-                if hasattr(chunk.choices[0].delta, "content") and chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
+                # Procesar contenido del mensaje (getattr con valor por defecto en lugar de
+                # hasattr + acceso repetido a chunk.choices[0].delta)
+                delta = chunk.choices[0].delta
+                content = getattr(delta, "content", None)
+                if content is not None:
+                    parts.append(content)
                     
+                    # Entregar el texto acumulado como máximo cada CALLBACK_INTERVAL segundos:
+                    # unir y repintar en cada fragmento es cuadrático en la longitud de la respuesta
                     if callback:
-                        callback(full_response)
+                        now = time.monotonic()
+                        if now - last_callback >= CALLBACK_INTERVAL:
+                            callback("".join(parts))
+                            rendered_parts = len(parts)
+                            last_callback = now
                 
                 # Procesar herramientas ejecutadas
-                if hasattr(chunk.choices[0].delta, "executed_tools") and chunk.choices[0].delta.executed_tools:
-                    # Convertir a diccionario para facilitar el manejo
-                    for tool in chunk.choices[0].delta.executed_tools:
-                        tool_dict = tool.model_dump() if hasattr(tool, "model_dump") else tool
-                        executed_tools.append(tool_dict)
-                        if self.logger:
-                            self.logger.info(f"Herramienta ejecutada: {tool_dict.get('type', 'desconocida')}")
+                # Guardar los objetos tal cual; se convierten a diccionario al terminar
+                chunk_tools = getattr(delta, "executed_tools", None)
+                if chunk_tools:
+                    executed_tools.extend(chunk_tools)
+            
+            # Entregar el texto final si quedaron fragmentos sin mostrar
+            if callback and rendered_parts < len(parts):
+                callback("".join(parts))
+            
+            executed_tools = self._dump_executed_tools(executed_tools)
             
             elapsed_time = time.time() - start_time
             
             if self.logger:
-                self.logger.info(f"Streaming completado: {chunk_count} chunks recibidos en {elapsed_time:.2f} segundos")
+                self.logger.info("Streaming completado: %d chunks recibidos en %.2f segundos", chunk_count, elapsed_time)
                 if executed_tools:
-                    self.logger.info(f"Herramientas ejecutadas: {len(executed_tools)}")
+                    self.logger.info("Herramientas ejecutadas: %d", len(executed_tools))
             
             return {
-                "content": full_response,
+                "content": "".join(parts),
                 "executed_tools": executed_tools
             }
         except Exception as e:
@@ -209,6 +332,25 @@ class GroqClient(BaseAPIClient):
                 "executed_tools": []
             }
     
+    def _dump_executed_tools(self, tools):
+        """
+        Convierte a diccionarios las herramientas ejecutadas recibidas en el streaming.
+        
+        Se llama una vez terminado el stream para que la conversión con
+        ``model_dump`` no retrase el consumo de los fragmentos.
+        
+        Args:
+            tools (list): Objetos de herramientas ejecutadas tal como llegan de la API.
+            
+        Returns:
+            list: Herramientas ejecutadas como diccionarios.
+        """
+        executed_tools = [tool.model_dump() if hasattr(tool, "model_dump") else tool for tool in tools]
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            for tool_dict in executed_tools:
+                self.logger.info("Herramienta ejecutada: %s", tool_dict.get("type", "desconocida"))
+        return executed_tools
+    
     def generate_response_with_tools(self, model, messages, tools, temperature, max_tokens, callback=None, tool_choice="auto"):
         """
         Genera una respuesta utilizando herramientas definidas (tools).
@@ -230,9 +372,9 @@ class GroqClient(BaseAPIClient):
         
         try:
             if self.logger:
-                self.logger.info(f"Iniciando llamada a API con herramientas (modelo: {model})")
-                self.logger.info(f"Parámetros: temperatura={temperature}, max_tokens={max_tokens}")
-                self.logger.info(f"Herramientas disponibles: {len(tools)}")
+                self.logger.info("Iniciando llamada a API con herramientas (modelo: %s)", model)
+                self.logger.info("Parámetros: temperatura=%s, max_tokens=%s", temperature, max_tokens)
+                self.logger.info("Herramientas disponibles: %d", len(tools))
             
             start_time = time.time()
             
@@ -249,14 +391,14 @@ class GroqClient(BaseAPIClient):
             elapsed_time = time.time() - start_time
             
             if self.logger:
-                self.logger.info(f"Respuesta recibida en {elapsed_time:.2f} segundos")
+                self.logger.info("Respuesta recibida en %.2f segundos", elapsed_time)
             
             # Extraer la respuesta y las llamadas a herramientas
             response_message = response.choices[0].message
             tool_calls = response_message.tool_calls if hasattr(response_message, "tool_calls") else []
             
             if tool_calls and self.logger:
-                self.logger.info(f"El modelo ha realizado {len(tool_calls)} llamadas a herramientas")
+                self.logger.info("El modelo ha realizado %d llamadas a herramientas", len(tool_calls))
             
             return {
                 "message": response_message,
@@ -276,6 +418,54 @@ class GroqClient(BaseAPIClient):
                 "tool_calls": []
             }
     
+    def _execute_tool_call(self, tool_call, available_functions):
+        """
+        Ejecuta una llamada a herramienta y devuelve su resultado.
+        
+        Args:
+            tool_call: Llamada a herramienta realizada por el modelo.
+            available_functions (dict): Diccionario con las funciones disponibles.
+            
+        Returns:
+            dict: Resultado de la función o diccionario de error.
+        """
+        function_name = tool_call.function.name
+        function_args = json.loads(tool_call.function.arguments)
+        
+        # Los argumentos pueden incluir el contenido completo del archivo generado:
+        # solo se registran sus claves y la longitud del contenido
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            if isinstance(function_args, dict):
+                content = function_args.get("content")
+                arg_names = sorted(function_args)
+            else:
+                content, arg_names = None, type(function_args).__name__
+            if isinstance(content, str):
+                content_size = f"{len(content)} caracteres"
+            elif isinstance(content, (list, dict)):
+                content_size = f"{len(content)} elementos"
+            else:
+                content_size = "sin contenido"
+            self.logger.info(
+                "Ejecutando función: %s con argumentos: %s (contenido: %s)",
+                function_name, arg_names, content_size
+            )
+        
+        # Verificar si la función existe
+        if function_name not in available_functions:
+            return {
+                "success": False,
+                "error": f"Función {function_name} no encontrada"
+            }
+        
+        try:
+            return available_functions[function_name](**function_args)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error al ejecutar {function_name}: {str(e)}"
+            }
+    
     def process_tool_calls(self, model, messages, tool_calls, available_functions, temperature, max_tokens):
         """
         Procesa las llamadas a herramientas y obtiene una respuesta final.
@@ -296,7 +486,7 @@ class GroqClient(BaseAPIClient):
         
         try:
             if self.logger:
-                self.logger.info(f"Procesando {len(tool_calls)} llamadas a herramientas")
+                self.logger.info("Procesando %d llamadas a herramientas", len(tool_calls))
             
             # Añadir el mensaje del asistente con las llamadas a herramientas
             assistant_message = messages[-1] if messages and messages[-1]["role"] == "assistant" else None
@@ -309,59 +499,23 @@ class GroqClient(BaseAPIClient):
                 }
                 messages.append(assistant_message)
             
-            # Procesar cada llamada a herramienta
-            tool_results = []
-            for tool_call in tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                if self.logger:
-                    self.logger.info(f"Ejecutando función: {function_name} con argumentos: {function_args}")
-                
-                # Verificar si la función existe
-                if function_name not in available_functions:
-                    error_result = {
-                        "success": False,
-                        "error": f"Función {function_name} no encontrada"
-                    }
-                    tool_results.append(error_result)
-                    
-                    # Añadir mensaje de error a la conversación
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps(error_result)
-                    })
-                    continue
-                
-                # Ejecutar la función
-                function_to_call = available_functions[function_name]
-                try:
-                    function_response = function_to_call(**function_args)
-                    tool_results.append(function_response)
-                    
-                    # Añadir resultado a la conversación
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps(function_response)
-                    })
-                except Exception as e:
-                    error_result = {
-                        "success": False,
-                        "error": f"Error al ejecutar {function_name}: {str(e)}"
-                    }
-                    tool_results.append(error_result)
-                    
-                    # Añadir mensaje de error a la conversación
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps(error_result)
-                    })
+            # Ejecutar las llamadas a herramientas; si hay varias (p. ej. varios archivos
+            # en una misma respuesta) se ejecutan en paralelo
+            if len(tool_calls) > 1:
+                tool_results = list(get_tool_executor().map(
+                    lambda tool_call: self._execute_tool_call(tool_call, available_functions), tool_calls
+                ))
+            else:
+                tool_results = [self._execute_tool_call(tool_call, available_functions) for tool_call in tool_calls]
+            
+            # Añadir los resultados a la conversación en el orden original
+            for tool_call, result in zip(tool_calls, tool_results):
+                messages.append({
+                    "tool_call_id": tool_call.id,
+                    "role": "tool",
+                    "name": tool_call.function.name,
+                    "content": json.dumps(result)
+                })
             
             # Realizar una segunda llamada a la API con los resultados de las herramientas
             if self.logger:
@@ -416,8 +570,8 @@ class GroqClient(BaseAPIClient):
         
         try:
             if self.logger:
-                self.logger.info(f"Iniciando llamada a API con imagen (modelo: {model})")
-                self.logger.info(f"Parámetros: temperatura={temperature}, max_tokens={max_tokens}")
+                self.logger.info("Iniciando llamada a API con imagen (modelo: %s)", model)
+                self.logger.info("Parámetros: temperatura=%s, max_tokens=%s", temperature, max_tokens)
             
             # Obtener el último mensaje para combinarlo con la imagen
             last_message = None
@@ -439,7 +593,7 @@ class GroqClient(BaseAPIClient):
             if "url" in image_data:
                 image_url = image_data["url"]
                 if self.logger:
-                    self.logger.info(f"Usando imagen desde URL: {image_url}")
+                    self.logger.info("Usando imagen desde URL: %s", image_url)
                 content.append({
                     "type": "image_url",
                     "image_url": {"url": image_url}
@@ -448,11 +602,11 @@ class GroqClient(BaseAPIClient):
                 # Verificar el tamaño de la imagen en base64
                 base64_size_mb = len(image_data["base64"]) * 3 / 4 / 1024 / 1024  # Estimación aproximada
                 if self.logger:
-                    self.logger.info(f"Tamaño aproximado de la imagen en base64: {base64_size_mb:.2f}MB")
+                    self.logger.info("Tamaño aproximado de la imagen en base64: %.2fMB", base64_size_mb)
                 
                 if base64_size_mb > 4:
                     if self.logger:
-                        self.logger.warning(f"La imagen es demasiado grande ({base64_size_mb:.2f}MB). Groq limita a 4MB para imágenes base64.")
+                        self.logger.warning("La imagen es demasiado grande (%.2fMB). Groq limita a 4MB para imágenes base64.", base64_size_mb)
                     raise ValueError(f"La imagen es demasiado grande ({base64_size_mb:.2f}MB). Groq limita a 4MB para imágenes base64.")
                 
                 content.append({
@@ -462,19 +616,19 @@ class GroqClient(BaseAPIClient):
             else:
                 raise ValueError("Los datos de imagen deben contener 'url' o 'base64'")
             
-            # Preparar los mensajes para la API
-            api_messages = []
-            
-            # Incluir el mensaje del sistema si existe
+            # Preparar los mensajes para la API en una sola pasada: el primer mensaje
+            # del sistema va al principio y se añaden los mensajes anteriores
+            # (excepto el último mensaje del usuario, comparado por identidad)
+            system_message = None
+            history = []
             for msg in messages:
                 if msg.get("role") == "system":
-                    api_messages.append(msg)
-                    break
+                    if system_message is None:
+                        system_message = msg
+                elif msg is not last_message:
+                    history.append(msg)
             
-            # Añadir mensajes anteriores (excepto el último mensaje del usuario)
-            for msg in messages:
-                if msg.get("role") != "system" and msg != last_message:
-                    api_messages.append(msg)
+            api_messages = [system_message] + history if system_message is not None else history
             
             # Añadir el mensaje con la imagen
             api_messages.append({
@@ -485,15 +639,16 @@ class GroqClient(BaseAPIClient):
             start_time = time.time()
             
             # Imprimir los mensajes para depuración
-            if self.logger:
-                self.logger.info(f"Enviando {len(api_messages)} mensajes a la API de Groq")
+            # (solo si el nivel INFO está activo, para no recorrer el historial en vano)
+            if self.logger and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Enviando %d mensajes a la API de Groq", len(api_messages))
                 for i, msg in enumerate(api_messages):
                     role = msg.get("role", "unknown")
                     if isinstance(msg.get("content"), list):
                         content_types = [c.get("type", "unknown") for c in msg.get("content", [])]
-                        self.logger.info(f"Mensaje {i}: role={role}, content_types={content_types}")
+                        self.logger.info("Mensaje %d: role=%s, content_types=%s", i, role, content_types)
                     else:
-                        self.logger.info(f"Mensaje {i}: role={role}, content=texto")
+                        self.logger.info("Mensaje %d: role=%s, content=texto", i, role)
             
             # Llamar a la API con streaming
             try:
@@ -514,37 +669,52 @@ class GroqClient(BaseAPIClient):
             if self.logger:
                 self.logger.info("Conexión establecida, comenzando streaming con imagen...")
             
-            full_response = ""
+            # Acumular los fragmentos en una lista en lugar de concatenar cadenas
+            parts = []
             executed_tools = []
             chunk_count = 0
+            # Número de fragmentos ya entregados al callback y momento de la última entrega
+            rendered_parts = 0
+            last_callback = 0.0
             
             for chunk in stream:
                 chunk_count += 1
                 
-                # Procesar contenido del mensaje
-                if hasattr(chunk.choices[0].delta, "content") and chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
+                # Procesar contenido del mensaje (getattr con valor por defecto en lugar de
+                # hasattr + acceso repetido a chunk.choices[0].delta)
+                delta = chunk.choices[0].delta
+                content = getattr(delta, "content", None)
+                if content is not None:
+                    parts.append(content)
                     
+                    # Entregar el texto acumulado como máximo cada CALLBACK_INTERVAL segundos:
+                    # unir y repintar en cada fragmento es cuadrático en la longitud de la respuesta
                     if callback:
-                        callback(full_response)
+                        now = time.monotonic()
+                        if now - last_callback >= CALLBACK_INTERVAL:
+                            callback("".join(parts))
+                            rendered_parts = len(parts)
+                            last_callback = now
                 
                 # Procesar herramientas ejecutadas
-                if hasattr(chunk.choices[0].delta, "executed_tools") and chunk.choices[0].delta.executed_tools:
-                    # Convertir a diccionario para facilitar el manejo
-                    for tool in chunk.choices[0].delta.executed_tools:
-                        tool_dict = tool.model_dump() if hasattr(tool, "model_dump") else tool
-                        executed_tools.append(tool_dict)
-                        if self.logger:
-                            self.logger.info(f"Herramienta ejecutada: {tool_dict.get('type', 'desconocida')}")
+                # Guardar los objetos tal cual; se convierten a diccionario al terminar
+                chunk_tools = getattr(delta, "executed_tools", None)
+                if chunk_tools:
+                    executed_tools.extend(chunk_tools)
+            
+            # Entregar el texto final si quedaron fragmentos sin mostrar
+            if callback and rendered_parts < len(parts):
+                callback("".join(parts))
+            
+            executed_tools = self._dump_executed_tools(executed_tools)
             
             elapsed_time = time.time() - start_time
             
             if self.logger:
-                self.logger.info(f"Streaming con imagen completado: {chunk_count} chunks recibidos en {elapsed_time:.2f} segundos")
+                self.logger.info("Streaming con imagen completado: %d chunks recibidos en %.2f segundos", chunk_count, elapsed_time)
             
             return {
-                "content": full_response,
+                "content": "".join(parts),
                 "executed_tools": executed_tools,
                 "image_processed": True
             }
@@ -3,6 +3,7 @@ Módulo para el componente de audio de la aplicación.
 """
 import streamlit as st
 import tempfile
+import shutil
 import os
 
 def display_audio_input(session_state):
@@ -35,11 +36,6 @@ def display_audio_input(session_state):
                 # Mostrar reproductor de audio
                 st.audio(uploaded_file, format=f"audio/{uploaded_file.type.split('/')[1]}")
                 
-                # Guardar el archivo temporalmente
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    temp_path = tmp_file.name
-                
                 # Opciones de transcripción
                 col1, col2 = st.columns(2)
                 with col1:
@@ -59,6 +55,14 @@ def display_audio_input(session_state):
                 
                 # Botón para transcribir
                 if st.button("Transcribir audio", key="transcribe_button"):
+                    # El audio permanece en memoria mientras solo se reproduce; se
+                    # escribe en disco (por bloques de 1 MiB) únicamente al transcribir,
+                    # en lugar de crear un archivo temporal nuevo en cada rerun
+                    uploaded_file.seek(0)
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
+                        shutil.copyfileobj(uploaded_file, tmp_file, length=1 << 20)
+                        temp_path = tmp_file.name
+                    
                     audio_data = {
                         "type": "file",
                         "path": temp_path,
@@ -9,76 +9,102 @@ from src.components.audio import display_audio_input
 from src.api.audio_transcription import AudioTranscriber
 from src.api.file_processor import FileProcessor
 
+def _build_render_info(msg):
+    """
+    Calcula una sola vez los datos derivados necesarios para mostrar un mensaje.
+    
+    Args:
+        msg (dict): Mensaje del historial.
+        
+    Returns:
+        dict: Rol, pie con el modelo usado, resumen de herramientas y búsquedas realizadas.
+    """
+    # Determinar el rol del mensaje (compatibilidad con formatos antiguos y nuevos)
+    if "role" in msg:
+        role = msg["role"]
+    elif "is_user" in msg:
+        role = "user" if msg["is_user"] else "assistant"
+    else:
+        # Si no se puede determinar el rol, usar un valor predeterminado
+        role = "assistant"
+    
+    info = {"role": role, "caption": None, "tools_caption": None, "search_tools": []}
+    
+    # Si es un mensaje del asistente y tiene información del modelo usado, mostrarla
+    if role == "assistant" and "model_used" in msg:
+        info["caption"] = f"Generado por: {get_model_display_name(msg['model_used'])}"
+        
+        # Si el mensaje tiene herramientas ejecutadas, preparar un indicador
+        if "executed_tools" in msg and msg["executed_tools"]:
+            search_tools = [tool for tool in msg["executed_tools"] if tool.get("type") == "search"]
+            code_count = sum(1 for tool in msg["executed_tools"] if tool.get("type") == "code_execution")
+            
+            tools_info = []
+            if search_tools:
+                tools_info.append(f"{len(search_tools)} búsquedas")
+            if code_count > 0:
+                tools_info.append(f"{code_count} ejecuciones de código")
+            
+            if tools_info:
+                info["tools_caption"] = f"Herramientas utilizadas: {', '.join(tools_info)}"
+            info["search_tools"] = search_tools
+    
+    return info
+
 def display_chat_history(session_state, models):
     """
     Muestra el historial de mensajes del chat.
     
+    Los datos derivados de cada mensaje (rol, modelo, herramientas) se calculan la
+    primera vez que se muestra y se guardan en ``msg["render_info"]``, de modo que
+    en cada recarga solo se emiten los elementos de la interfaz.
+    
     Args:
         session_state (SessionState): Estado de la sesión de Streamlit.
         models (dict): Diccionario de modelos disponibles.
     """
-    for i, msg in enumerate(session_state.messages):
-        # Determinar el rol del mensaje (compatibilidad con formatos antiguos y nuevos)
-        if "role" in msg:
-            role = msg["role"]
-        elif "is_user" in msg:
-            role = "user" if msg["is_user"] else "assistant"
-        else:
-            # Si no se puede determinar el rol, usar un valor predeterminado
-            role = "assistant"
+    for msg in session_state.messages:
+        info = msg.get("render_info")
+        if info is None:
+            info = msg["render_info"] = _build_render_info(msg)
+            
+        with st.chat_message(info["role"]):
+            if info["caption"]:
+                st.caption(info["caption"])
             
-        with st.chat_message(role):
-            # Si es un mensaje del asistente y tiene información del modelo usado, mostrarla
-            if role == "assistant" and "model_used" in msg:
-                model_name = get_model_display_name(msg["model_used"])
-                st.caption(f"Generado por: {model_name}")
+            if info["tools_caption"]:
+                st.caption(info["tools_caption"])
                 
-                # Si el mensaje tiene herramientas ejecutadas, mostrar un indicador
-                if "executed_tools" in msg and msg["executed_tools"]:
-                    tool_count = len(msg["executed_tools"])
-                    search_count = sum(1 for tool in msg["executed_tools"] if tool.get("type") == "search")
-                    code_count = sum(1 for tool in msg["executed_tools"] if tool.get("type") == "code_execution")
-                    
-                    if search_count > 0 or code_count > 0:
-                        tools_info = []
-                        if search_count > 0:
-                            tools_info.append(f"{search_count} búsquedas")
-                        if code_count > 0:
-                            tools_info.append(f"{code_count} ejecuciones de código")
-                        
-                        st.caption(f"Herramientas utilizadas: {', '.join(tools_info)}")
-                        
-                        # Mostrar las fuentes de las búsquedas en un expander
-                        if search_count > 0:
-                            with st.expander("Ver fuentes utilizadas", expanded=False):
-                                for tool in msg["executed_tools"]:
-                                    if tool.get("type") == "search":
-                                        # Manejar input de forma segura (puede ser string o dict)
-                                        tool_input = tool.get("input", {})
-                                        if isinstance(tool_input, str):
-                                            query = "Consulta desconocida"
-                                        else:
-                                            query = tool_input.get("query", "Consulta desconocida")
-                                        
-                                        st.markdown(f"**Búsqueda**: {query}")
-                                        
-                                        # Manejar output de forma segura (puede ser string o dict)
-                                        tool_output = tool.get("output", {})
-                                        if isinstance(tool_output, str):
-                                            st.markdown("Formato de respuesta no compatible con visualización de fuentes")
-                                            continue
-                                        
-                                        # Mostrar resultados y sus URLs
-                                        results = tool_output.get("results", [])
-                                        if results:
-                                            for result in results:
-                                                title = result.get("title", "Sin título")
-                                                url = result.get("url", "#")
-                                                st.markdown(f"- [{title}]({url})")
-                                        else:
-                                            st.markdown("No se encontraron resultados")
-                                        
-                                        st.markdown("---")
+                # Mostrar las fuentes de las búsquedas en un expander
+                if info["search_tools"]:
+                    with st.expander("Ver fuentes utilizadas", expanded=False):
+                        for tool in info["search_tools"]:
+                            # Manejar input de forma segura (puede ser string o dict)
+                            tool_input = tool.get("input", {})
+                            if isinstance(tool_input, str):
+                                query = "Consulta desconocida"
+                            else:
+                                query = tool_input.get("query", "Consulta desconocida")
+                            
+                            st.markdown(f"**Búsqueda**: {query}")
+                            
+                            # Manejar output de forma segura (puede ser string o dict)
+                            tool_output = tool.get("output", {})
+                            if isinstance(tool_output, str):
+                                st.markdown("Formato de respuesta no compatible con visualización de fuentes")
+                                continue
+                            
+                            # Mostrar resultados y sus URLs
+                            results = tool_output.get("results", [])
+                            if results:
+                                for result in results:
+                                    title = result.get("title", "Sin título")
+                                    url = result.get("url", "#")
+                                    st.markdown(f"- [{title}]({url})")
+                            else:
+                                st.markdown("No se encontraron resultados")
+                            
+                            st.markdown("---")
             
             # Mostrar el contenido del mensaje
             st.markdown(msg["content"])
@@ -143,7 +169,7 @@ def add_file_context(session_state, api_messages, current_model, logger):
 
     return api_messages
 
-def prepare_api_messages(session_state, current_model, logger):
+def prepare_api_messages(session_state, current_model, logger, history=None):
     """
     Prepara los mensajes para enviar a la API, filtrando campos personalizados
     y limitando el contexto según el modelo.
@@ -152,10 +178,14 @@ def prepare_api_messages(session_state, current_model, logger):
         session_state (SessionState): Estado de la sesión de Streamlit.
         current_model (str): ID del modelo actual.
         logger (logging.Logger): Logger para registrar información.
+        history (list, optional): Historial a utilizar en lugar de ``session_state.messages``.
         
     Returns:
         list: Lista de mensajes preparados para la API.
     """
+    if history is None:
+        history = session_state.messages
+    
     # Preparar mensajes para la API (filtrando campos personalizados y limitando el contexto)
     api_messages = [
         {"role": "system", "content": session_state.context["system_prompt"]}
@@ -184,7 +214,7 @@ def prepare_api_messages(session_state, current_model, logger):
     
     # Añadir mensajes del historial filtrando campos personalizados y limitando la cantidad
     # Tomamos solo los mensajes más recientes para no exceder los límites
-    recent_messages = session_state.messages[-max_context_messages:] if len(session_state.messages) > max_context_messages else session_state.messages
+    recent_messages = history[-max_context_messages:] if len(history) > max_context_messages else history
     
     for msg in recent_messages:
         # Determinar el rol del mensaje (compatibilidad con formatos antiguos y nuevos)
@@ -238,7 +268,69 @@ def display_agentic_context(session_state):
                     st.code(execution['result'])
                 st.markdown("---")
 
-def handle_user_input(prompt, session_state, groq_client, logger):
+def start_speculative_response(prompt, session_state, groq_client, logger, executor):
+    """
+    Lanza en segundo plano la respuesta de chat que se usaría si el prompt no
+    termina siendo una solicitud de generación de archivos.
+    
+    Así la llamada con herramientas y la respuesta normal viajan en paralelo en
+    lugar de una detrás de otra. Solo se especula en el caso simple (sin audio ni
+    imágenes pendientes), que es el que sigue ``handle_user_input``.
+    
+    Args:
+        prompt (str): Mensaje del usuario.
+        session_state (SessionState): Estado de la sesión de Streamlit.
+        groq_client (GroqClient): Cliente de la API de Groq.
+        logger (logging.Logger): Logger para registrar información.
+        executor (concurrent.futures.Executor): Pool de hilos donde abrir el stream.
+        
+    Returns:
+        dict or None: Diccionario con ``api_messages`` y ``future`` o None si no se especula.
+    """
+    if not groq_client.is_configured():
+        return None
+    
+    if getattr(session_state, "pending_audio_transcription", None):
+        return None
+    
+    current_model = session_state.context["model"]
+    model_obj = get_model(current_model)
+    supports_vision = hasattr(model_obj, "supports_vision") and model_obj.supports_vision
+    if session_state.context.get("enable_vision", False) and supports_vision:
+        recent_images = session_state.image_context.get("recent_images", []) if "image_context" in session_state else []
+        if any(not img.get("processed", False) for img in recent_images):
+            return None
+    
+    history = session_state.messages + [{"role": "user", "content": prompt}]
+    api_messages = prepare_api_messages(session_state, current_model, logger, history=history)
+    
+    future = executor.submit(
+        groq_client.open_stream,
+        model=current_model,
+        messages=api_messages,
+        temperature=session_state.context["temperature"],
+        max_tokens=session_state.context["max_tokens"]
+    )
+    return {"api_messages": api_messages, "future": future}
+
+def discard_speculative_response(speculative, logger):
+    """
+    Descarta una respuesta especulativa cerrando su stream cuando esté disponible.
+    
+    Args:
+        speculative (dict): Resultado de ``start_speculative_response``.
+        logger (logging.Logger): Logger para registrar información.
+    """
+    def _close_stream(future):
+        try:
+            future.result().close()
+        except Exception as e:
+            logger.warning(f"No se pudo cerrar el stream especulativo: {str(e)}")
+    
+    logger.info("Descartando respuesta especulativa")
+    speculative["future"].add_done_callback(_close_stream)
+
+def handle_user_input(prompt, session_state, groq_client, logger, speculative=None):
     """
     Maneja la entrada del usuario y genera una respuesta.
     
@@ -247,6 +339,8 @@ def handle_user_input(prompt, session_state, groq_client, logger):
         session_state (SessionState): Estado de la sesión de Streamlit.
         groq_client (GroqClient): Cliente de la API de Groq.
         logger (logging.Logger): Logger para registrar información.
+        speculative (dict, optional): Respuesta lanzada de antemano con
+            ``start_speculative_response`` para reutilizar su stream.
     """
     # Verificar si hay una transcripción de audio pendiente
     if hasattr(session_state, 'pending_audio_transcription') and session_state.pending_audio_transcription:
@@ -288,8 +382,11 @@ def handle_user_input(prompt, session_state, groq_client, logger):
     with st.chat_message("user"):
         st.markdown(prompt)
     
-    # Preparar mensajes para la API
-    api_messages = prepare_api_messages(session_state, current_model, logger)
+    # Preparar mensajes para la API (reutilizando los de la respuesta especulativa si existe)
+    if speculative:
+        api_messages = speculative["api_messages"]
+    else:
+        api_messages = prepare_api_messages(session_state, current_model, logger)
     
     # Inicializar el gestor de herramientas agénticas si está habilitado
     agentic_tools_manager = None
@@ -340,6 +437,9 @@ def handle_user_input(prompt, session_state, groq_client, logger):
             # Si hay una imagen pendiente, usar la API con soporte de visión
             logger.info(f"Generando respuesta con imagen usando modelo {current_model}")
             
+            if speculative:
+                discard_speculative_response(speculative, logger)
+            
             # Preparar datos de la imagen
             image_data = {
                 "base64": pending_image["base64"]
@@ -376,7 +476,8 @@ def handle_user_input(prompt, session_state, groq_client, logger):
                 messages=api_messages,
                 temperature=session_state.context["temperature"],
                 max_tokens=session_state.context["max_tokens"],
-                callback=update_response
+                callback=update_response,
+                pending_stream=speculative["future"] if speculative else None
             )
         
         # Procesar la respuesta (ahora puede ser un diccionario con content y executed_tools)
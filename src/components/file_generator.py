@@ -42,7 +42,8 @@ def display_file_download(file_info: Dict[str, Any]):
     
     Args:
         file_info (Dict[str, Any]): Información del archivo generado.
-            Debe contener las claves: file_path, file_name, file_type, success.
+            Debe contener las claves: file_name, file_type, success y, además,
+            file_path o data (contenido en memoria generado con ``generate_bytes``).
     """
     if not file_info.get("success", False):
         st.error(f"Error al generar el archivo: {file_info.get('error', 'Error desconocido')}")
@@ -52,13 +53,15 @@ def display_file_download(file_info: Dict[str, Any]):
     file_name = file_info.get("file_name")
     file_type = file_info.get("file_type")
     
-    if not file_path or not os.path.exists(file_path):
-        st.error(f"El archivo no existe en la ruta especificada: {file_path}")
-        return
-    
-    # Leer el contenido del archivo
-    with open(file_path, "rb") as f:
-        file_content = f.read()
+    # Usar el contenido en memoria si existe; si no, leerlo del archivo
+    file_content = file_info.get("data")
+    if file_content is None:
+        if not file_path or not os.path.exists(file_path):
+            st.error(f"El archivo no existe en la ruta especificada: {file_path}")
+            return
+        
+        with open(file_path, "rb") as f:
+            file_content = f.read()
     
     # Codificar el contenido en base64
     b64_content = base64.b64encode(file_content).decode()
@@ -87,27 +90,63 @@ def display_file_download(file_info: Dict[str, Any]):
     
     # Mostrar una vista previa del contenido según el tipo de archivo
     with st.expander("👁️ Vista previa del contenido"):
+        # Reutilizar los bytes ya leídos en lugar de volver a abrir el archivo
         if file_type == "json":
             import json
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = json.load(f)
-            st.json(content)
+            st.json(json.loads(file_content))
         elif file_type == "python":
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            st.code(content, language="python")
+            st.code(file_content.decode("utf-8"), language="python")
         elif file_type == "markdown":
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            st.markdown(content)
+            st.markdown(file_content.decode("utf-8"))
         else:  # text
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            st.text(content)
+            st.text(file_content.decode("utf-8", errors="replace"))
     
     # Mostrar botón de descarga
     st.markdown(download_button, unsafe_allow_html=True)
 
+# Palabras clave que indican una solicitud de generación de archivo
+FILE_GENERATION_KEYWORDS = [
+    "genera", "generar", "crear", "crea", "hacer", "haz", "escribe", "escribir",
+    "archivo", "fichero", "documento", "json", "python", "markdown", "txt", "texto",
+    "código", "script", "programa", "documentación"
+]
+
+def is_file_generation_prompt(prompt: str) -> bool:
+    """
+    Indica si el prompt contiene palabras clave de generación de archivos.
+    
+    Args:
+        prompt (str): Prompt del usuario.
+        
+    Returns:
+        bool: True si el prompt podría ser una solicitud de generación de archivo.
+    """
+    prompt_lower = prompt.lower()
+    return any(keyword in prompt_lower for keyword in FILE_GENERATION_KEYWORDS)
+
+# Palabras que nombran explícitamente un archivo o formato. Si aparecen, es muy
+# probable que el prompt termine en una llamada con herramientas
+FILE_REQUEST_EXPLICIT_KEYWORDS = [
+    "archivo", "fichero", "documento", "json", "csv", "excel", "python", "markdown",
+    "txt", "script", "programa", "documentación", "descargar", "descargable"
+]
+
+def is_explicit_file_request(prompt: str) -> bool:
+    """
+    Indica si el prompt nombra explícitamente un archivo o un formato.
+    
+    A diferencia de ``is_file_generation_prompt``, no se activa con verbos de uso
+    cotidiano como "crea", "haz" o "escribe".
+    
+    Args:
+        prompt (str): Prompt del usuario.
+        
+    Returns:
+        bool: True si es probable que el prompt sea una solicitud de archivo.
+    """
+    prompt_lower = prompt.lower()
+    return any(keyword in prompt_lower for keyword in FILE_REQUEST_EXPLICIT_KEYWORDS)
+
 def handle_file_generation_request(prompt: str, session_state, groq_client, file_generator, logger=None):
     """
     Maneja una solicitud de generación de archivo basada en el prompt del usuario.
@@ -122,17 +161,8 @@ def handle_file_generation_request(prompt: str, session_state, groq_client, file
     Returns:
         bool: True si se detectó y procesó una solicitud de generación de archivo, False en caso contrario.
     """
-    # Palabras clave que indican una solicitud de generación de archivo
-    file_generation_keywords = [
-        "genera", "generar", "crear", "crea", "hacer", "haz", "escribe", "escribir",
-        "archivo", "fichero", "documento", "json", "python", "markdown", "txt", "texto",
-        "código", "script", "programa", "documentación"
-    ]
-    
     # Verificar si el prompt contiene palabras clave de generación de archivo
-    contains_keywords = any(keyword.lower() in prompt.lower() for keyword in file_generation_keywords)
-    
-    if not contains_keywords:
+    if not is_file_generation_prompt(prompt):
         return False
     
     # Obtener el modelo actual y parámetros de generación
@@ -4,7 +4,7 @@ Módulo para la barra lateral de la aplicación.
 import streamlit as st
 import os
 import uuid
-from src.models.config import AVAILABLE_MODELS, get_model
+from src.models.config import AVAILABLE_MODELS, AVAILABLE_MODEL_KEYS, AVAILABLE_MODEL_INDEX, get_model
 from src.utils.agentic_tools_manager import AgenticToolsManager
 from src.utils.image_processor import resize_image, encode_image_to_base64, save_uploaded_image
 
@@ -40,10 +40,9 @@ def render_sidebar(session_state, groq_client, logger):
         # Usar key dinámica para forzar la recreación del widget cuando cambia el modelo
         selected_model = st.selectbox(
             "Selecciona un modelo",
-            options=list(AVAILABLE_MODELS.keys()),
+            options=AVAILABLE_MODEL_KEYS,
             format_func=lambda x: AVAILABLE_MODELS[x],
-            index=list(AVAILABLE_MODELS.keys()).index(session_state.context["model"]) 
-                if session_state.context["model"] in AVAILABLE_MODELS else 0,
+            index=AVAILABLE_MODEL_INDEX.get(session_state.context["model"], 0),
             key=f"model_select_{session_state.context['model']}"
         )
         
@@ -210,33 +209,38 @@ def render_sidebar(session_state, groq_client, logger):
                 "exclude_domains": [domain.strip() for domain in exclude_domains.split(",") if domain.strip()]
             })
         
-        # Parámetros de generación
-        st.subheader("Parámetros")
-        temperature = st.slider(
-            "Temperatura", 
-            min_value=0.0, 
-            max_value=1.0, 
-            value=session_state.context["temperature"],
-            step=0.1,
-            help="Controla la aleatoriedad de las respuestas. Valores más altos = más creatividad."
-        )
-        
-        max_tokens = st.slider(
-            "Máximo de tokens", 
-            min_value=256, 
-            max_value=4096, 
-            value=session_state.context["max_tokens"],
-            step=128,
-            help="Número máximo de tokens en la respuesta."
-        )
-        
-        # System prompt
-        st.subheader("System Prompt")
-        system_prompt = st.text_area(
-            "Instrucciones para el asistente",
-            value=session_state.context["system_prompt"],
-            height=150
-        )
+        # Los parámetros se agrupan en un formulario: arrastrar un slider o escribir
+        # en el system prompt no relanza el script hasta pulsar "Aplicar"
+        with st.form("sidebar_params_form"):
+            # Parámetros de generación
+            st.subheader("Parámetros")
+            temperature = st.slider(
+                "Temperatura", 
+                min_value=0.0, 
+                max_value=1.0, 
+                value=session_state.context["temperature"],
+                step=0.1,
+                help="Controla la aleatoriedad de las respuestas. Valores más altos = más creatividad."
+            )
+            
+            max_tokens = st.slider(
+                "Máximo de tokens", 
+                min_value=256, 
+                max_value=4096, 
+                value=session_state.context["max_tokens"],
+                step=128,
+                help="Número máximo de tokens en la respuesta."
+            )
+            
+            # System prompt
+            st.subheader("System Prompt")
+            system_prompt = st.text_area(
+                "Instrucciones para el asistente",
+                value=session_state.context["system_prompt"],
+                height=150
+            )
+            
+            st.form_submit_button("Aplicar")
         
         # Detectar cambios en la configuración
         config_changed = False
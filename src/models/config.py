@@ -45,6 +45,10 @@ def get_model(model_id):
 # Obtener todos los modelos disponibles
 AVAILABLE_MODELS = {model_id: model.display_name for model_id, model in get_all_models().items()}
 
+# Opciones del selector de modelo y su posición, calculadas una sola vez
+AVAILABLE_MODEL_KEYS = tuple(AVAILABLE_MODELS.keys())
+AVAILABLE_MODEL_INDEX = {model_id: i for i, model_id in enumerate(AVAILABLE_MODEL_KEYS)}
+
 def get_model_display_name(model_id):
     """
     Obtiene el nombre de visualización de un modelo.
@@ -1,15 +1,33 @@
 """Utilidades para procesar texto en archivos."""
 
-from typing import Callable, List, Dict, Any
+from typing import Callable, Iterator, List, Dict, Any
 import re
 import json
 import io
+import codecs
+from itertools import islice
+
+try:
+    import pypdfium2 as pdfium
+except Exception:  # pragma: no cover - dependency opcional
+    pdfium = None
 
 try:
     from PyPDF2 import PdfReader
 except Exception:  # pragma: no cover - dependency opcional
     PdfReader = None
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependency opcional
+    orjson = None
+
+# Tamaño de los bloques que se decodifican al resumir datos binarios
+DECODE_BLOCK_SIZE = 1 << 16
+
+# Palabras o signos de puntuación individuales; compilado una sola vez
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
 
 def tokenize_text(text: str) -> List[str]:
     """Divide el texto en tokens usando espacios y puntuación como separadores.
@@ -21,36 +39,48 @@ def tokenize_text(text: str) -> List[str]:
         Lista de tokens encontrados.
     """
     # Usamos una expresión regular sencilla para separar palabras y signos
-    return re.findall(r"\w+|[^\w\s]", text)
+    return _TOKEN_RE.findall(text)
 
 
-def split_text_by_tokens(text: str, max_tokens: int, tokenizer: Callable[[str], List[str]] | None = None) -> List[str]:
-    """Divide un texto en partes que no excedan un número de tokens.
+def iter_text_chunks(text: str, max_tokens: int, tokenizer: Callable[[str], List[str]] | None = None) -> Iterator[str]:
+    """Genera perezosamente partes de texto que no excedan un número de tokens.
+
+    Con el tokenizador por defecto los tokens se leen de forma incremental, de
+    modo que nunca se materializa la lista completa de tokens ni la de fragmentos.
 
     Args:
         text: Texto completo a dividir.
         max_tokens: Número máximo de tokens por parte.
         tokenizer: Función opcional para convertir texto en tokens.
 
-    Returns:
-        Lista de fragmentos de texto.
+    Yields:
+        Fragmentos de texto.
     """
-    tokenizer = tokenizer or tokenize_text
-    tokens = tokenizer(text)
+    if tokenizer is None:
+        tokens = (match.group() for match in _TOKEN_RE.finditer(text))
+    else:
+        tokens = iter(tokenizer(text))
+
+    size = max(max_tokens, 1)
+    while True:
+        batch = list(islice(tokens, size))
+        if not batch:
+            return
+        yield " ".join(batch)
 
-    chunks: List[str] = []
-    current: List[str] = []
 
-    for token in tokens:
-        if len(current) >= max_tokens:
-            chunks.append(" ".join(current))
-            current = []
-        current.append(token)
+def split_text_by_tokens(text: str, max_tokens: int, tokenizer: Callable[[str], List[str]] | None = None) -> List[str]:
+    """Divide un texto en partes que no excedan un número de tokens.
 
-    if current:
-        chunks.append(" ".join(current))
+    Args:
+        text: Texto completo a dividir.
+        max_tokens: Número máximo de tokens por parte.
+        tokenizer: Función opcional para convertir texto en tokens.
 
-    return chunks
+    Returns:
+        Lista de fragmentos de texto.
+    """
+    return list(iter_text_chunks(text, max_tokens, tokenizer))
 
 
 def summarize_text(text: str, max_tokens: int, tokenizer: Callable[[str], List[str]] | None = None) -> str:
@@ -66,8 +96,12 @@ def summarize_text(text: str, max_tokens: int, tokenizer: Callable[[str], List[s
     Returns:
         Texto original o resumido si excede el límite.
     """
-    tokenizer = tokenizer or tokenize_text
-    tokens = tokenizer(text)
+    if tokenizer is None:
+        # Con el tokenizador por defecto basta con leer max_tokens + 1 tokens para
+        # saber si hay que truncar; el resto del documento no se recorre
+        tokens = [match.group() for match in islice(_TOKEN_RE.finditer(text), max_tokens + 1)]
+    else:
+        tokens = tokenizer(text)
 
     if len(tokens) <= max_tokens:
         return text
@@ -76,23 +110,69 @@ def summarize_text(text: str, max_tokens: int, tokenizer: Callable[[str], List[s
     return " ".join(summary_tokens) + " ..."
 
 
+def summarize_bytes(content: bytes | bytearray | memoryview, max_tokens: int) -> str:
+    """Resume datos de texto UTF-8 decodificando solo la parte necesaria.
+
+    Equivale a ``summarize_text(read_text(content), max_tokens)``, pero decodifica
+    por bloques sobre una vista de memoria y se detiene en cuanto encuentra más de
+    ``max_tokens`` tokens, sin crear una copia ``str`` del archivo completo.
+
+    Args:
+        content: Datos binarios del texto.
+        max_tokens: Número máximo de tokens permitidos.
+
+    Returns:
+        Texto original o resumido si excede el límite.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    view = memoryview(content)
+    text = ""
+    tokens: List[str] = []
+    pos = 0
+
+    for start in range(0, len(view), DECODE_BLOCK_SIZE):
+        text += decoder.decode(view[start:start + DECODE_BLOCK_SIZE])
+        for match in _TOKEN_RE.finditer(text, pos):
+            # Un token que llega al final del bloque puede continuar en el siguiente
+            if match.end() == len(text):
+                break
+            tokens.append(match.group())
+            pos = match.end()
+            if len(tokens) > max_tokens:
+                return " ".join(tokens[:max_tokens]) + " ..."
+
+    text += decoder.decode(b"", final=True)
+    return summarize_text(text, max_tokens)
+
+
 def read_text(content: bytes | str) -> str:
     """Lee datos de texto y los decodifica a una cadena."""
 
-    if isinstance(content, bytes):
-        return content.decode("utf-8", errors="ignore")
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return str(content, "utf-8", "ignore")
     return content
 
 
 def read_json(content: bytes | str) -> Dict[str, Any]:
     """Convierte datos JSON a un diccionario."""
 
+    if orjson is not None:
+        try:
+            # orjson acepta los bytes directamente, sin decodificarlos antes a str
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # UTF-8 inválido o BOM: se recurre a la decodificación tolerante de abajo
+            pass
+
     text = read_text(content)
     return json.loads(text)
 
 
 def read_pdf(content: bytes) -> str:
-    """Extrae texto de un PDF utilizando ``PyPDF2``.
+    """Extrae texto de un PDF.
+
+    Usa ``pypdfium2`` (PDFium, extracción en C) si está instalado y, en caso
+    contrario, ``PyPDF2``.
 
     Args:
         content: Datos binarios del PDF.
@@ -101,15 +181,81 @@ def read_pdf(content: bytes) -> str:
         Texto extraído del PDF.
 
     Raises:
-        ImportError: Si ``PyPDF2`` no está disponible.
+        ImportError: Si no hay ninguna biblioteca de PDF disponible.
     """
 
+    return "\n".join(iter_pdf_pages(content)).strip()
+
+
+def iter_pdf_pages(content: bytes) -> Iterator[str]:
+    """Recorre el texto de un PDF página a página, sin construir el documento completo.
+
+    Args:
+        content: Datos binarios del PDF.
+
+    Yields:
+        Texto de cada página.
+
+    Raises:
+        ImportError: Si no hay ninguna biblioteca de PDF disponible.
+    """
+
+    if pdfium is not None:
+        return _iter_pdfium_pages(content)
+
     if PdfReader is None:
         raise ImportError("PyPDF2 es necesario para leer archivos PDF")
 
     reader = PdfReader(io.BytesIO(content))
-    text = ""
-    for page in reader.pages:
-        page_text = page.extract_text() or ""
-        text += page_text + "\n"
-    return text.strip()
+    return (page.extract_text() or "" for page in reader.pages)
+
+
+def summarize_pdf(content: bytes, max_tokens: int) -> str:
+    """Resume un PDF extrayendo solo las páginas necesarias.
+
+    Equivale a ``summarize_text(read_pdf(content), max_tokens)``: las páginas se
+    unen con saltos de línea, por lo que ningún token cruza de una página a otra y
+    se pueden contar página a página. La extracción se detiene en cuanto se
+    superan ``max_tokens`` tokens.
+
+    Args:
+        content: Datos binarios del PDF.
+        max_tokens: Número máximo de tokens permitidos.
+
+    Returns:
+        Texto completo del PDF o resumen si excede el límite.
+    """
+    pages: List[str] = []
+    tokens: List[str] = []
+
+    for page_text in iter_pdf_pages(content):
+        pages.append(page_text)
+        needed = max_tokens + 1 - len(tokens)
+        tokens.extend(match.group() for match in islice(_TOKEN_RE.finditer(page_text), needed))
+        if len(tokens) > max_tokens:
+            return " ".join(tokens[:max_tokens]) + " ..."
+
+    return "\n".join(pages).strip()
+
+
+def _iter_pdfium_pages(content: bytes) -> Iterator[str]:
+    """Extrae el texto de cada página con ``pypdfium2``, liberando cada página al terminar.
+
+    Args:
+        content: Datos binarios del PDF.
+
+    Yields:
+        Texto de cada página.
+    """
+    pdf = pdfium.PdfDocument(content)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
@@ -5,7 +5,6 @@ import os
 import base64
 import uuid
 import time
-import datetime
 from PIL import Image
 import io
 import logging
@@ -631,9 +630,8 @@ def check_and_cleanup_temp_images(directory="temp_images", hours_threshold=24.0)
         
         # Registrar resultado
         if deleted_count > 0:
+            # La hora de la limpieza la añade el formateador del logger (asctime)
             logger.info(f"Limpieza completada: {deleted_count} archivos eliminados")
-            current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            logger.info(f"Hora de limpieza: {current_time}")
         else:
             logger.info("No se encontraron archivos temporales para eliminar")
             
@@ -13,10 +13,17 @@ def setup_logger(name="MetanoIA"):
     Returns:
         logging.Logger: Instancia del logger configurado.
     """
+    logger = logging.getLogger(name)
+    
+    # Streamlit vuelve a ejecutar main() en cada interacción; si ya hay handlers
+    # configurados (propios o heredados) no se vuelve a configurar el logging
+    if logger.hasHandlers():
+        return logger
+    
     # Configurar sistema de logging
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    return logging.getLogger(name)
+    return logger
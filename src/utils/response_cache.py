@@ -0,0 +1,250 @@
+"""
+Módulo con una caché de respuestas de la API en dos niveles (memoria y disco).
+
+El nivel en memoria es un LRU de acceso inmediato; el nivel en disco permite que las
+respuestas sobrevivan a reinicios del proceso de Streamlit. Las claves se calculan
+una sola vez con XXH3-128 (o BLAKE2b si ``xxhash`` no está instalado) a partir de los
+parámetros de la llamada, de modo que no es necesario volver a recorrer el historial
+completo en cada búsqueda.
+"""
+import os
+import json
+import time
+import hashlib
+import getpass
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - dependencia opcional
+    xxhash = None
+
+# Directorio por defecto para el nivel en disco: uno por usuario del sistema, ya que
+# el directorio temporal es compartido y las respuestas no deben ser legibles por otros
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), f"metanoia_cache-{getpass.getuser()}")
+
+# Permisos de los directorios y archivos de la caché (solo el propietario)
+_DIR_MODE = 0o700
+_FILE_MODE = 0o600
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _make_private_dir(path: str) -> bool:
+    """
+    Crea un directorio (y los intermedios que falten) accesible solo por el propietario.
+
+    ``os.makedirs`` aplica ``mode`` únicamente al último componente, por eso los
+    directorios que faltan se crean uno a uno.
+
+    Args:
+        path (str): Ruta del directorio.
+
+    Returns:
+        bool: True si el directorio existe y pertenece al usuario actual.
+    """
+    missing = []
+    current = os.path.abspath(path)
+    while not os.path.isdir(current):
+        missing.append(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+
+    for directory in reversed(missing):
+        os.makedirs(directory, mode=_DIR_MODE, exist_ok=True)
+
+    # Un directorio creado de antemano por otro usuario no es seguro
+    getuid = getattr(os, "getuid", None)
+    return getuid is None or os.stat(path).st_uid == getuid()
+
+
+def canonical_json(messages) -> str:
+    """
+    Serializa los mensajes en una forma JSON canónica.
+
+    Las claves se ordenan y se eliminan los espacios, de modo que dos historiales
+    equivalentes producen siempre la misma cadena (y por tanto la misma clave).
+
+    Args:
+        messages (list): Lista de mensajes a serializar.
+
+    Returns:
+        str: Representación JSON canónica de los mensajes.
+    """
+    return json.dumps(messages, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def canonical_json_bytes(messages) -> bytes:
+    """
+    Serializa los mensajes en JSON canónico directamente a bytes UTF-8.
+
+    Usa ``orjson`` con ``OPT_SORT_KEYS`` si está disponible, lo que evita la
+    serialización en Python y la codificación intermedia a ``str``.
+
+    Args:
+        messages (list): Lista de mensajes a serializar.
+
+    Returns:
+        bytes: Representación JSON canónica de los mensajes.
+    """
+    if orjson is not None:
+        return orjson.dumps(messages, option=orjson.OPT_SORT_KEYS)
+    return canonical_json(messages).encode("utf-8")
+
+
+class ResponseCache:
+    """
+    Caché de respuestas con un nivel LRU en memoria y un nivel persistente en disco.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, maxsize: int = 1024, ttl: int = 3600):
+        """
+        Inicializa la caché.
+
+        Args:
+            cache_dir (str, optional): Directorio del nivel en disco. Si es None,
+                solo se utiliza el nivel en memoria.
+            maxsize (int): Número máximo de entradas en memoria.
+            ttl (int): Tiempo de vida de las entradas en segundos.
+        """
+        self.cache_dir = cache_dir
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        # El LRU en memoria se comparte entre las sesiones (hilos) de Streamlit
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            try:
+                if _make_private_dir(self.cache_dir):
+                    self._purge_expired()
+                else:
+                    self.cache_dir = None
+            except OSError:
+                # Sin un directorio privado se usa solo el nivel en memoria
+                self.cache_dir = None
+
+    @staticmethod
+    def make_key(model: str, messages_str: Union[str, bytes], temperature: float, max_tokens: int) -> str:
+        """
+        Calcula la clave de caché para una llamada.
+
+        Usa XXH3-128 cuando ``xxhash`` está disponible, ya que es mucho más rápido
+        que BLAKE2b sobre historiales largos; la clave no necesita ser criptográfica.
+
+        Args:
+            model (str): ID del modelo.
+            messages_str (str or bytes): Mensajes serializados con ``canonical_json``
+                o ``canonical_json_bytes``.
+            temperature (float): Temperatura de generación.
+            max_tokens (int): Número máximo de tokens de la respuesta.
+
+        Returns:
+            str: Resumen hexadecimal de 128 bits.
+        """
+        digest = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+        digest.update(f"{model}\x00{temperature}\x00{max_tokens}\x00".encode("utf-8"))
+        if isinstance(messages_str, str):
+            messages_str = messages_str.encode("utf-8")
+        digest.update(messages_str)
+        return digest.hexdigest()
+
+    def _purge_expired(self) -> None:
+        """Elimina del disco las entradas caducadas (según su fecha de modificación)."""
+        cutoff = time.time() - self.ttl
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+
+    def _disk_path(self, key: str) -> str:
+        """Devuelve la ruta del archivo asociado a una clave."""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Busca una respuesta en memoria y, si no está, en disco.
+
+        Args:
+            key (str): Clave calculada con ``make_key``.
+
+        Returns:
+            str or None: Respuesta cacheada o None si no existe o ha caducado.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, response = entry
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    return response
+                del self._memory[key]
+
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if now - data.get("created", 0) > self.ttl:
+            # Borrar la entrada caducada para que el directorio no crezca sin límite
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+
+        self._remember(key, data["created"], data["response"])
+        return data["response"]
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Guarda una respuesta en ambos niveles.
+
+        Args:
+            key (str): Clave calculada con ``make_key``.
+            response (str): Respuesta a guardar.
+        """
+        created = time.time()
+        self._remember(key, created, response)
+
+        if not self.cache_dir:
+            return
+
+        try:
+            # Serializar antes de abrir el archivo y escribirlo con una sola llamada
+            payload = json.dumps({"created": created, "response": response}, ensure_ascii=False).encode("utf-8")
+            fd = os.open(self._disk_path(key), _WRITE_FLAGS, _FILE_MODE)
+            with open(fd, "wb") as f:
+                f.write(payload)
+        except OSError:
+            # El nivel en disco es opcional; un fallo al escribir no debe romper la llamada
+            pass
+
+    def _remember(self, key: str, created: float, response: str) -> None:
+        """Inserta una entrada en el LRU de memoria respetando ``maxsize``."""
+        with self._lock:
+            self._memory[key] = (created, response)
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
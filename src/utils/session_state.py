@@ -44,6 +44,40 @@ def initialize_session_state():
 
     return st.session_state
 
+# Listas del estado de la sesión que contienen rutas de archivos temporales
+TEMP_FILE_LISTS = ("temp_audio_files", "temp_files", "temp_image_files")
+
+def _unlink(file_path):
+    """
+    Elimina un archivo ignorando que ya no exista.
+    
+    Un único ``unlink`` evita la llamada previa a ``os.path.exists`` (un ``stat``
+    adicional por archivo) y la carrera entre la comprobación y el borrado.
+    
+    Args:
+        file_path (str): Ruta del archivo a eliminar.
+    """
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
+
+def _remove_files(file_paths, error_message):
+    """
+    Elimina una lista de archivos temporales mostrando un aviso por cada fallo.
+    
+    Args:
+        file_paths (list): Rutas de los archivos a eliminar.
+        error_message (str): Texto del aviso que se muestra si falla un borrado.
+    """
+    for file_path in file_paths:
+        if not file_path:
+            continue
+        try:
+            _unlink(file_path)
+        except Exception as e:
+            st.warning(f"{error_message}: {str(e)}")
+
 def cleanup_temp_files(session_state):
     """
     Limpia todos los archivos temporales generados durante la sesión.
@@ -55,38 +89,27 @@ def cleanup_temp_files(session_state):
     Args:
         session_state (SessionState): Estado de la sesión de Streamlit.
     """
+    # Salir de inmediato si no hay nada que limpiar (caso habitual en cada rerun)
+    if not session_state.get("processed_files") and not any(session_state.get(key) for key in TEMP_FILE_LISTS):
+        return
+    
     # Limpiar archivos de audio temporales
     if "temp_audio_files" in session_state and session_state.temp_audio_files:
-        for file_path in session_state.temp_audio_files:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                st.warning(f"Error al eliminar archivo temporal de audio: {str(e)}")
+        _remove_files(session_state.temp_audio_files, "Error al eliminar archivo temporal de audio")
         
         # Limpiar la lista después de eliminar
         session_state.temp_audio_files = []
     
     # Limpiar archivos generados temporales
     if "temp_files" in session_state and session_state.temp_files:
-        for file_path in session_state.temp_files:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                st.warning(f"Error al eliminar archivo temporal generado: {str(e)}")
+        _remove_files(session_state.temp_files, "Error al eliminar archivo temporal generado")
         
         # Limpiar la lista después de eliminar
         session_state.temp_files = []
     
     # Limpiar imágenes temporales
     if "temp_image_files" in session_state and session_state.temp_image_files:
-        for file_path in session_state.temp_image_files:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                st.warning(f"Error al eliminar imagen temporal: {str(e)}")
+        _remove_files(session_state.temp_image_files, "Error al eliminar imagen temporal")
         
         # Limpiar la lista después de eliminar
         session_state.temp_image_files = []
@@ -96,8 +119,9 @@ def cleanup_temp_files(session_state):
         for file_info in session_state.processed_files:
             if "file_path" in file_info and file_info["file_path"]:
                 try:
-                    if os.path.exists(file_info["file_path"]):
-                        os.remove(file_info["file_path"])
+                    _unlink(file_info["file_path"])
+                    # Olvidar la ruta para no volver a comprobarla en cada rerun
+                    file_info["file_path"] = None
                 except Exception as e:
                     st.warning(f"Error al eliminar archivo procesado: {str(e)}")
         